@@ -1,14 +1,16 @@
-import csv
 import json
 import os
-import schedule
 import sys
+import threading
 import time
 from datetime import datetime
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../")))
 from lib.redfish_api import RedfishApi
 from lib.generate_report import Report
+from lib.power_store import PowerStore
+from lib.power_analytics import PowerAnalytics
+from lib.poll_scheduler import PollScheduler
 import os
 import lib.logger as logging
 
@@ -17,66 +19,103 @@ ob = RedfishApi()
 gr = Report()
 local_path = os.path.dirname(os.path.realpath(__file__))
 
-with open("../config/config_redfish.json") as config_json:
+with open(os.path.join(local_path, "../config/config_redfish.json")) as config_json:
     config_dict = json.load(config_json)
 
 time_interval = config_dict["time_interval"]
 time_type = config_dict["time_type"]
-num_system = len(config_dict["systems"])
+seconds = {"seconds": 1, "minutes": 60, "hours": 3600}.get(time_type, 3600)
 
-fields = ['date_time']
+store = PowerStore(config_dict.get("power_store", "power_store"),
+                   segment_seconds=config_dict.get("power_store_segment_seconds", 86400))
 
-for host in range(num_system):
-    server = (config_dict["systems"][host]["login_host"])
-    hostip = 'server_power(w): {}'.format(server)
-    fields.append(hostip)
+if len(sys.argv) > 2 and sys.argv[1] == "export":
+    # python power_data.py export records.csv
+    print("{} rows written to {}".format(store.export_csv(sys.argv[2]), sys.argv[2]))
+    sys.exit(0)
 
-global csv_file, csv_writer
-csv_file = open('records.csv', 'a')
-csvwriter = csv.writer(csv_file)
-csvwriter.writerow(fields)
-csv_file.close()
+if len(sys.argv) > 1 and sys.argv[1] == "stats":
+    # python power_data.py stats [days], default last 7 days
+    end = time.time()
+    start = end - float(sys.argv[2] if len(sys.argv) > 2 else 7) * 86400
+    analytics = PowerAnalytics(store)
+    print("fleet draw p50/p99 (W): {}".format(analytics.fleet_percentile([50, 99], time_interval * seconds, start,
+                                                                         end)))
+    print("per host peaks (W): {}".format(analytics.host_peaks(start, end)))
+    print("threshold violations: {}".format(analytics.threshold_violations(config_dict["power_threshold"], start, end)))
+    sys.exit(0)
 
+ob.redfishapi()
 
-def test_inventory():
+power_threshold = config_dict["power_threshold"]
+contexts = {ctx.login_host: ctx for ctx in ob.contexts}
+threshold_lock = threading.Lock()
+
+
+def poll_host(login_host):
     """
-        Method to fetch power of multiple servers and generate a csv file and log file
-        :return: None
+        Method to fetch the power of one server and store it in the power store and log file
+        :param login_host: host ip or name.
+        :return: current power in watts or None
     """
-    power_list = ob.multi_power_usage()
-    power_threshold = config_dict["power_threshold"]
-    for server in power_list:
-        if server[2] >= power_threshold:
-            server_ip = server[0]
-            line = "server: {} power is {} exceeded the threshold value".format(server_ip, server[2])
-            s = str(datetime.now())
+    ctx = contexts[login_host]
+    # stamped with the poll start, a slow BMC does not move its sample into a later cycle
+    polled_at = time.time()
+    row = ob.collect_host_power(ctx)
+    # report rows are not used here, don't let them pile up
+    ctx.drain_report()
+    if row is None:
+        return None
+    store.append(polled_at, [[row[0]] + row[2:6]])
+    if not isinstance(row[2], (int, float)):
+        return None
+    if row[2] >= power_threshold:
+        line = "server: {} power is {} exceeded the threshold value".format(login_host, row[2])
+        s = str(datetime.now())
+        with threshold_lock:
             with open('power_threshold.txt', 'a') as f:
                 f.write(s + '\t')
                 f.writelines(line + '\n')
+    return row[2]
+
+
+scheduler = PollScheduler(poll_host, time_interval * seconds,
+                          jitter=config_dict.get("poll_jitter", 0.1),
+                          fast_interval=config_dict.get("poll_fast_interval"),
+                          threshold=power_threshold,
+                          near_threshold=config_dict.get("poll_near_threshold", 0.9),
+                          workers=config_dict.get("fleet_workers", 16))
+for system in config_dict["systems"]:
+    # "poll_interval" of a system overrides time_interval, in seconds
+    scheduler.add_host(system["login_host"], system.get("poll_interval"))
+
+listener = None
+if config_dict.get("event_listener_destination"):
+    # an event of a host (power state change, PSU alert...) polls it right away instead of at its next tick
+    listener = ob.create_event_listener()
+    listener.subscribe(lambda event: scheduler.poll_now(event.context if event.context in contexts else event.sender),
+                       kind="Event")
+    # with "power_source": "telemetry" pushed MetricReports replace the report GET of a poll
+    listener.subscribe(ob.handle_metric_report, kind="MetricReport")
+    listener.start()
+    logger.info("event subscriptions: {}".format(ob.subscribe_fleet_events()))
+    if config_dict.get("power_source") == "telemetry":
+        logger.info("metric report subscriptions: {}".format(ob.subscribe_fleet_events(subs_type="MetricReport")))
+
+
+def log_stats():
+    while True:
+        time.sleep(max(time_interval * seconds, 60))
+        stats = scheduler.stats()
+        logger.info("polls: {} overruns: {} skipped ticks: {} event polls: {} max lag: {:.2f}s".format(
+            stats["polls"], stats["overruns"], stats["skipped"], stats["triggered"], stats["max_lag"]))
+
 
-    rows = []
-    for i in power_list:
-        rows.append(i[2])
-
-    filename = "records.csv"
-    with open(filename, 'a') as csv_file:
-        csvwriter = csv.writer(csv_file)
-        current_date_time = datetime.now()
-        row1 = [str(current_date_time)]
-        row2 = row1 + rows
-        csvwriter.writerow(row2)
-        #Fix to remove duplicate rows in csv output
-        #for val in row2:
-        #    csvwriter.writerow(row2)
-
-
-if time_type == "seconds":
-    schedule.every(time_interval).seconds.do(test_inventory)
-elif time_type == "minutes":
-    schedule.every(time_interval).minutes.do(test_inventory)
-else:
-    schedule.every(time_interval).hours.do(test_inventory)
-
-while True:
-    schedule.run_pending()
-    time.sleep(1)
+threading.Thread(target=log_stats, daemon=True).start()
+try:
+    scheduler.run()
+except KeyboardInterrupt:
+    scheduler.stop()
+finally:
+    if listener is not None:
+        listener.stop()
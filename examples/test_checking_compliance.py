@@ -20,4 +20,5 @@ def test_hardware_management():
     bool_resp, result = ob.get_power_state()
     logger.info(result)
     if bool_resp == True:
+        ob.finish_json_validation()
         gr.generate_report(ob.html_results)
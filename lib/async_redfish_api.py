@@ -0,0 +1,718 @@
+#Copyright (c) 2024 Samsung Electronics Corporation
+#SPDX-License-Identifier: BSD-3-Clause
+
+import asyncio
+import json
+import os
+import random
+import sys
+from urllib.parse import quote
+
+import aiohttp  # asyncio HTTP client, you can install it by using "pip3 install aiohttp"-command in your system.
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../lib")))
+import logger as logging
+from discovery_cache import DiscoveryCache
+from event_listener import EventDispatcher
+from host_context import HostContext
+from redfish_api import RedfishApi
+
+logger = logging.get_logger(__name__)
+
+INVENTORY_EXCLUDED_KEYS = ["Description", "@odata.context", "@odata.id", "@odata.type", "Links", "Actions",
+                           "RelatedItem"]
+CHASSIS_EXCLUDED_KEYS = ["@odata.type", "ThermalSubsystem", "PowerSubsystem", "EnvironmentMetrics", "Sensors",
+                         "Controls", "Thermal", "Thermal@Redfish.Deprecated", "Power@Redfish.Deprecated", "Power",
+                         "Links", "@odata.id"]
+PSU_KEYS = ["Name", "SerialNumber", "PowerOutputWatts", "EfficiencyPercent", "LineInputVoltage", "PartNumber",
+            "FirmwareVersion", "PowerCapacityWatts", "PowerInputWatts", "Model", "PowerSupplyType", "Status",
+            "Manufacturer", "HotPluggable", "LastPowerOutputWatts", "InputRanges", "LineInputVoltageType", "Location",
+            "SparePartNumber"]
+
+
+class AsyncRedfishResponse:
+    """
+    Response of AsyncRedfishClient, offering the attributes RedfishApi uses on redfish library responses.
+    """
+
+    def __init__(self, status, headers, text):
+        self.status = status
+        self.headers = headers
+        self.text = text
+        self._dict = None
+
+    @property
+    def dict(self):
+        # parsed once, callers read the body many times
+        if self._dict is None:
+            self._dict = json.loads(self.text) if self.text else {}
+        return self._dict
+
+    def getheader(self, name):
+        return self.headers.get(name)
+
+    @property
+    def task_location(self):
+        return self.getheader("Location")
+
+    @property
+    def retry_after(self):
+        retry_after = self.getheader("Retry-After")
+        return int(retry_after) if retry_after and retry_after.isdigit() else None
+
+
+class AsyncRedfishClient:
+    """
+    asyncio Redfish client for one BMC. All clients of a process share the running event loop.
+    """
+
+    def __init__(self, base_url, username, password, connection_limit=8, timeout=60):
+        self.base_url = base_url.rstrip("/")
+        self.username = username
+        self.password = password
+        self.connection_limit = connection_limit
+        self.timeout = timeout
+        self.auth = None
+        self._auth = None
+        self._session_key = None
+        self._session_location = None
+        self._login_lock = None
+        self._session = None
+        self._stream_session = None
+
+    def _get_session(self):
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.connection_limit, ssl=False),
+                timeout=aiohttp.ClientTimeout(total=self.timeout))
+        return self._session
+
+    async def login(self, auth="session"):
+        """
+        Method to authenticate the following requests.
+        :param auth: "session" creates one Redfish session (X-Auth-Token), "basic" sends credentials on every request.
+        :return: None
+        """
+        self.auth = auth
+        if auth == "basic":
+            self._auth = aiohttp.BasicAuth(self.username, self.password)
+            return
+        response = await self._send("post", "/redfish/v1/SessionService/Sessions",
+                                    body={"UserName": self.username, "Password": self.password})
+        if response.status not in [200, 201, 202, 204] or not response.getheader("X-Auth-Token"):
+            raise Exception("HTTP {}: Failed to create the session for {}".format(response.status, self.base_url))
+        self._session_key = response.getheader("X-Auth-Token")
+        self._session_location = response.getheader("Location") or response.dict.get("@odata.id")
+
+    async def logout(self):
+        """
+        Method to delete the Redfish session of the client.
+        :return: None
+        """
+        if self._session_key and self._session_location:
+            await self._send("delete", self._session_location)
+        self._session_key = None
+        self._session_location = None
+
+    async def _send(self, method, path, body=None, headers=None):
+        url = path if path.startswith("http") else self.base_url + path
+        headers = dict(headers) if headers else {}
+        if self._session_key:
+            headers["X-Auth-Token"] = self._session_key
+        kwargs = {"headers": headers, "auth": self._auth}
+        if isinstance(body, (str, bytes)):
+            kwargs["data"] = body
+        elif body is not None:
+            kwargs["json"] = body
+        async with self._get_session().request(method.upper(), url, **kwargs) as response:
+            text = await response.text()
+            return AsyncRedfishResponse(response.status, response.headers, text)
+
+    async def _relogin(self, session_key):
+        if self._login_lock is None:
+            self._login_lock = asyncio.Lock()
+        async with self._login_lock:
+            if self._session_key == session_key:
+                logger.info("{} returned 401, re-authenticating".format(self.base_url))
+                self._session_key = None
+                await self.login(auth="session")
+
+    async def request(self, method, path, body=None, headers=None):
+        """
+        Method to send one request to the BMC, re-authenticating once if the session was rejected with 401.
+        :param method: 'get','post','patch','delete'
+        :param path: absolute url or path below base_url
+        :param body: request body, dict bodies are sent as JSON
+        :param headers: request headers
+        :return: AsyncRedfishResponse
+        """
+        session_key = self._session_key
+        response = await self._send(method, path, body=body, headers=headers)
+        if response.status == 401 and self.auth == "session":
+            await self._relogin(session_key)
+            response = await self._send(method, path, body=body, headers=headers)
+        return response
+
+    async def get(self, path, headers=None):
+        return await self.request("get", path, headers=headers)
+
+    async def patch(self, path, body=None, headers=None):
+        return await self.request("patch", path, body=body, headers=headers)
+
+    async def post(self, path, body=None, headers=None):
+        return await self.request("post", path, body=body, headers=headers)
+
+    async def delete(self, path, headers=None):
+        return await self.request("delete", path, headers=headers)
+
+    async def stream_events(self, path, last_event_id=None, read_timeout=None):
+        """
+        Method to read a Server-Sent Events stream (i.e EventService ServerSentEventUri) until the BMC closes it.
+        The stream has its own connection, it doesn't take one of the connection_limit request connections.
+        :param path: absolute url or path below base_url
+        :param last_event_id: id of the last event received, the BMC resends the events after it.
+        :param read_timeout: seconds without data (keep-alive comments included) after which the stream is dropped.
+        :return: async generator of dicts with "id", "event" and "data" of each event
+        """
+        url = path if path.startswith("http") else self.base_url + path
+        headers = {"Accept": "text/event-stream"}
+        if last_event_id is not None:
+            headers["Last-Event-ID"] = last_event_id
+        if self._session_key:
+            headers["X-Auth-Token"] = self._session_key
+        if self._stream_session is None or self._stream_session.closed:
+            self._stream_session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(ssl=False))
+        session_key = self._session_key
+        async with self._stream_session.get(url, headers=headers, auth=self._auth,
+                                            timeout=aiohttp.ClientTimeout(total=None, sock_connect=self.timeout,
+                                                                          sock_read=read_timeout)) as response:
+            if response.status == 401 and self.auth == "session":
+                await self._relogin(session_key)
+            if response.status != 200:
+                raise Exception("HTTP {}: Failed to open the event stream {}".format(response.status, url))
+            message = {"id": None, "event": None, "data": []}
+            async for line in response.content:
+                line = line.decode("utf-8").rstrip("\r\n")
+                if not line:
+                    if message["data"]:
+                        yield {"id": message["id"], "event": message["event"], "data": "\n".join(message["data"])}
+                    message = {"id": message["id"], "event": None, "data": []}
+                    continue
+                if line.startswith(":"):
+                    continue
+                field, _, value = line.partition(":")
+                value = value[1:] if value.startswith(" ") else value
+                if field == "data":
+                    message["data"].append(value)
+                elif field == "id":
+                    message["id"] = value
+                elif field == "event":
+                    message["event"] = value
+
+    async def close(self):
+        """
+        Method to log out and close the connections of the client.
+        :return: None
+        """
+        if self._stream_session is not None and not self._stream_session.closed:
+            await self._stream_session.close()
+        if self._session is not None and not self._session.closed:
+            try:
+                await self.logout()
+            except Exception as e:
+                logger.error("{} logout failed, error msg: {}".format(self.base_url, e))
+            await self._session.close()
+
+
+class AsyncRedfishApi(RedfishApi):
+    """
+    asyncio variant of RedfishApi. Every async_* method takes the HostContext of the host it works on, so that
+    requests to all hosts can be in flight on one event loop at the same time.
+    """
+
+    async def async_redfishapi(self):
+        """
+        Method to read the configuration and create one HostContext with an AsyncRedfishClient per system.
+        :return: None
+        """
+        try:
+            with open("config/config_redfish.json") as config_json:
+                self.config_dict = json.load(config_json)
+        except Exception as e:
+            logger.error("error msg: {}".format(e))
+            sys.exit(1)
+        self.contexts = []
+        self.login_host = self.config_dict["systems"][0]["login_host"]
+        if self.config_dict.get("discovery_cache"):
+            self.discovery_cache = DiscoveryCache(self.config_dict["discovery_cache"],
+                                                  ttl=self.config_dict.get("discovery_cache_ttl", 86400))
+        else:
+            self.discovery_cache = None
+        self.schema_registry = self.create_schema_registry()
+        self.validation_pipeline = self.create_validation_pipeline()
+        clients = [AsyncRedfishClient("https://" + system["login_host"], system["username"], system["password"],
+                                      connection_limit=self.config_dict.get("per_host_fetch_workers", 4))
+                   for system in self.config_dict["systems"]]
+        logins = await asyncio.gather(*[client.login(auth=self.config_dict.get("auth", "session"))
+                                        for client in clients], return_exceptions=True)
+        for system, client, result in zip(self.config_dict["systems"], clients, logins):
+            if isinstance(result, Exception):
+                # an unreachable BMC doesn't keep the other hosts from starting
+                logger.error("system {} login failed, skipping it, error msg: {}".format(system["login_host"], result))
+                await client.close()
+                continue
+            self.contexts.append(HostContext(system["login_host"], client))
+        if not self.contexts:
+            logger.error("error msg: no system could be logged in")
+            sys.exit(1)
+        with self.discovery_batch():
+            results = await asyncio.gather(*[self.async_discover_system_identity(ctx) for ctx in self.contexts],
+                                           return_exceptions=True)
+        for ctx, result in zip(self.contexts, results):
+            if isinstance(result, Exception):
+                logger.error("system {} error msg: {}".format(ctx.login_host, result))
+        self.default_context = self.contexts[-1].fork()
+
+    async def async_close(self):
+        """
+        Method to log out the sessions and close the connections of all hosts.
+        :return: None
+        """
+        await asyncio.gather(*[ctx.client.close() for ctx in self.contexts])
+
+    async def async_discover_system_identity(self, ctx):
+        """
+        Method to read RedfishVersion, OEM vendor, system manufacturer, system model and the system, chassis and
+        manager urls of the host, using a fresh discovery cache entry when there is one.
+        :param ctx: HostContext of the host.
+        :return: None
+        """
+        entry = self.discovery_cache.get(ctx.login_host) if self.discovery_cache else None
+        if entry is not None and self.discovery_cache.is_fresh(entry):
+            self.apply_identity(ctx, entry)
+            return
+        response = await ctx.client.get(self.config_dict["base_url"])
+        service_root = response.dict
+        entry = {"etag": response.getheader("ETag") or service_root.get("@odata.etag"),
+                 "redfish_version": service_root["RedfishVersion"]}
+        oem_keys = list(service_root.get("Oem", {}).keys())
+        entry["oem_vendor"] = oem_keys[0] if oem_keys else None
+        entry["protocol_features"] = self.parse_protocol_features(service_root)
+        if entry["redfish_version"] in ["1.8.0", "1.11.0"] and not (
+                entry["redfish_version"] == "1.11.0" and entry["oem_vendor"] == "Dell"):
+            system_url = self.config_dict["system_url_1_8"]
+        else:
+            system_url = self.config_dict["system_url"]
+        collections = [("Systems", "system_urls"), ("Chassis", "chassis_urls"), ("Managers", "manager_urls")]
+        responses = await asyncio.gather(ctx.client.get(system_url), *[
+            ctx.client.get(service_root[collection]["@odata.id"]) for collection, field in collections
+            if collection in service_root])
+        system_resource = responses[0].dict
+        entry["system_manufacturer"] = system_resource["Manufacturer"]
+        entry["system_model"] = system_resource["Model"]
+        collection_responses = iter(responses[1:])
+        for collection, field in collections:
+            if collection in service_root:
+                members = next(collection_responses).dict.get("Members", [])
+                entry[field] = [member["@odata.id"] for member in members]
+            else:
+                entry[field] = []
+        self.apply_identity(ctx, entry)
+        if self.discovery_cache is not None:
+            self.discovery_cache.put(ctx.login_host, entry)
+
+    async def async_get_event_service(self, ctx):
+        """
+        Method to get the EventService resource of the host.
+        :param ctx: HostContext of the host.
+        :return: Bool, EventService response
+        """
+        bool_resp, response_base_url = await self.async_redfish_response(ctx, "get", self.config_dict["base_url"])
+        if bool_resp == False or "EventService" not in response_base_url.dict:
+            return False, None
+        return await self.async_redfish_response(ctx, "get", response_base_url.dict["EventService"]["@odata.id"])
+
+    async def async_stream_events(self, ctx, dispatcher, sse_filter=None):
+        """
+        Method to hold the Server-Sent Events stream of the host and hand its events to the dispatcher, reconnecting
+        with Last-Event-ID after errors (backoff up to "sse_max_reconnect_interval" seconds). Runs until cancelled,
+        or returns when the BMC has no ServerSentEventUri.
+        :param ctx: HostContext of the host.
+        :param dispatcher: EventDispatcher, events are handled with the login host as sender.
+        :param sse_filter: $filter of the stream i.e "EventFormatType eq 'MetricReport'", optional.
+        :return: None
+        """
+        max_interval = self.config_dict.get("sse_max_reconnect_interval", 60)
+        read_timeout = self.config_dict.get("sse_read_timeout", 300)
+        stream_url = None
+        last_event_id = None
+        interval = 1
+        while True:
+            try:
+                if stream_url is None:
+                    bool_resp, response_event_url = await self.async_get_event_service(ctx)
+                    if bool_resp == False:
+                        raise Exception("Failed to get the EventService")
+                    stream_url = response_event_url.dict.get("ServerSentEventUri")
+                    if stream_url is None:
+                        logger.error("system {} has no ServerSentEventUri".format(ctx.login_host))
+                        return
+                    if sse_filter:
+                        stream_url = stream_url + "?$filter=" + quote(sse_filter, safe="'")
+                async for message in ctx.client.stream_events(stream_url, last_event_id=last_event_id,
+                                                              read_timeout=read_timeout):
+                    interval = 1
+                    if message["id"] is not None:
+                        last_event_id = message["id"]
+                    try:
+                        dispatcher.handle(ctx.login_host, json.loads(message["data"]))
+                    except Exception as e:
+                        logger.error("system {} sent a bad event, error msg: {}".format(ctx.login_host, e))
+                logger.info("system {} closed the event stream".format(ctx.login_host))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("system {} event stream error msg: {}".format(ctx.login_host, e))
+            await asyncio.sleep(interval * random.uniform(0.5, 1))
+            interval = min(interval * 2, max_interval)
+
+    def create_event_dispatcher(self, queue=None):
+        """
+        Method to create the dispatcher fanning the streamed events out to its subscribers.
+        :param queue: queue.Queue receiving the events, optional.
+        :return: EventDispatcher with config "event_dedup_size"
+        """
+        return EventDispatcher(dedup_size=self.config_dict.get("event_dedup_size", 10000), queue=queue)
+
+    async def async_stream_fleet_events(self, dispatcher, sse_filter=None):
+        """
+        Method to hold the Server-Sent Events streams of all configured systems on the running event loop, until
+        cancelled. Subscriber callbacks run on the event loop and must not block.
+        :param dispatcher: EventDispatcher the events are fanned out by, see create_event_dispatcher().
+        :param sse_filter: $filter of the streams, optional.
+        :return: None
+        """
+        await asyncio.gather(*[self.async_stream_events(ctx, dispatcher, sse_filter) for ctx in self.contexts])
+
+    async def async_monitor_task(self, ctx, response):
+        """
+        Method to wait for a Redfish task started by a PATCH/POST without blocking the event loop.
+        :param ctx: HostContext of the host.
+        :param response: response of the PATCH/POST request.
+        :return: final response of the task monitor
+        """
+        task = response
+        while task.status == 202 and response.task_location:
+            await asyncio.sleep(task.retry_after if task.retry_after else 5)
+            task = await ctx.client.get(response.task_location)
+        return task
+
+    async def async_redfish_response(self, ctx, method, url, body=None, headers=None):
+        """
+        Method to get json response from given request( i.e. get,post,patch etc)
+        :param ctx: HostContext of the host.
+        :param method: method refers to the 'get','post','patch','delete' here
+        :param url: url from which response is required
+        :param body: request body for certain requests(i.e. patch,post etc), default value is None
+        :param headers: request headers, default value is None
+        :return: Bool,json response
+        """
+        response = None
+        try:
+            response = await ctx.client.request(method, url, body=body, headers=headers)
+            # report row of this url is written in one step, concurrent requests of the host can't interleave it
+            with self.use_context(ctx):
+                if self.config_dict["validate_url"]:
+                    self.validate_uri(url)
+                if method != "get":
+                    self.html_results = self.html_results + "<td class=\"notvalid center\" width=\"30%\">N/A</td></tr>"
+                if response.status not in self.config_dict["response_codes"]["success"]:
+                    raise Exception("Failed")
+                if method == "get":
+                    self.validate_json(url, response)
+            if method in ["patch", "post"]:
+                await self.async_monitor_task(ctx, response)
+            return True, response
+        except Exception:
+            logger.error("'{}' for url : '{}' failed with response code : {} and error msg : {}".format(
+                method, url, response.status if response is not None else None,
+                self.get_extended_error_msg(response)))
+            return False, response
+
+    async def async_get_member_urls(self, ctx, collection_url):
+        """
+        Method to get member urls of a collection.
+        :param ctx: HostContext of the host.
+        :param collection_url: collection url(i.e /Systems, /Chassis)
+        :return: Bool, list of member urls
+        """
+        bool_resp, response = await self.async_redfish_response(ctx, "get", collection_url)
+        if bool_resp == False:
+            return False, []
+        return True, [member["@odata.id"] for member in response.dict["Members"]]
+
+    async def async_get_system_urls(self, ctx):
+        """
+        Method to get system urls of the configured system_id.
+        :param ctx: HostContext of the host.
+        :return: Bool, list of system urls
+        """
+        system_id = self.config_dict["system_id"]
+        bool_resp, response_base_url = await self.async_redfish_response(ctx, "get", self.config_dict["base_url"])
+        if bool_resp == False:
+            return False, []
+        bool_resp1, system = await self.async_get_member_urls(ctx, response_base_url.dict["Systems"]["@odata.id"])
+        if bool_resp1 == False or not system:
+            return False, []
+        if system_id is None:
+            return True, system[:1]
+        if system_id == "all":
+            return True, system
+        return True, [system_url for system_url in system if system_id in system_url][:1]
+
+    async def async_get_chassis_members(self, ctx):
+        """
+        Method to get all chassis member resources of the host.
+        :param ctx: HostContext of the host.
+        :return: Bool, list of (chassis_url, chassis response)
+        """
+        bool_resp, response_base_url = await self.async_redfish_response(ctx, "get", self.config_dict["base_url"])
+        if bool_resp == False:
+            return False, []
+        bool_resp1, chassis = await self.async_get_member_urls(ctx, response_base_url.dict["Chassis"]["@odata.id"])
+        if bool_resp1 == False:
+            return False, []
+        responses = await asyncio.gather(*[self.async_redfish_response(ctx, "get", url) for url in chassis])
+        if not all(bool_resp for bool_resp, response in responses):
+            return False, []
+        return True, [(url, response) for url, (bool_resp, response) in zip(chassis, responses)]
+
+    async def async_get_power_state(self, ctx) -> (bool, list):
+        """
+        Method to get power state of the system.
+        :param ctx: HostContext of the host.
+        :return: Bool,List of power states of the systems required.
+        """
+        try:
+            power_details = []
+            bool_resp, system = await self.async_get_system_urls(ctx)
+            if bool_resp == False:
+                raise Exception("System url list is empty.")
+            responses = await asyncio.gather(*[self.async_redfish_response(ctx, "get", url) for url in system])
+            for system_x_url, (bool_resp2, response_system_x_url) in zip(system, responses):
+                if bool_resp2 == False:
+                    raise Exception("Failed")
+                power_details.append({"SystemUrl": system_x_url,
+                                      "PowerState": response_system_x_url.dict["PowerState"]})
+            return True, power_details
+        except Exception as e:
+            logger.error("error msg: {}".format(e))
+            return False, power_details
+
+    async def async_power_usage(self, ctx):
+        """
+        Method to get power usage.
+        :param ctx: HostContext of the host.
+        :return: Bool, [current, average, max, min, power state]
+        """
+        try:
+            bool_resp, chassis = await self.async_get_chassis_members(ctx)
+            if bool_resp == False:
+                raise Exception("Failed")
+            for chassis_x_url, response_chassis_x_url in chassis:
+                if "Power" not in response_chassis_x_url.dict:
+                    continue
+                (bool_respx, response_power_url), power_state_resp = await asyncio.gather(
+                    self.async_redfish_response(ctx, "get", response_chassis_x_url.dict["Power"]["@odata.id"]),
+                    self.async_get_power_state(ctx))
+                if bool_respx == False:
+                    raise Exception("Failed")
+                power_control = response_power_url.dict["PowerControl"][0]
+                if ctx.redfish_version == "1.8.0":
+                    power_usage_list = [power_control["PowerConsumedWatts"], "N/A", "N/A", "N/A"]
+                else:
+                    power_metrics = power_control["PowerMetrics"]
+                    power_usage_list = [power_control["PowerConsumedWatts"], power_metrics["AverageConsumedWatts"],
+                                        power_metrics["MaxConsumedWatts"], power_metrics["MinConsumedWatts"]]
+                power_usage_list.append("Power " + power_state_resp[1][0]['PowerState'])
+                return True, power_usage_list
+            raise Exception("No chassis with Power resource")
+        except Exception as e:
+            logger.error("Error occurred while fetching power usage,error msg: {}".format(e))
+            return False, None
+
+    async def async_multi_power_usage(self):
+        """
+        Method to get power usage of all configured systems concurrently on the running event loop.
+        :return: List of rows in the format of RedfishApi.multi_power_usage
+        """
+        results = await asyncio.gather(*[self.async_power_usage(ctx) for ctx in self.contexts])
+        output = []
+        for ctx, (status, function_out) in zip(self.contexts, results):
+            self.html_results = self.html_results + ctx.drain_report()
+            if status:
+                output.append([ctx.login_host, "{} {}".format(ctx.system_manufacturer, ctx.system_model)] +
+                              function_out)
+        power_consume = sum(system[2] for system in output)
+        output.append(['Total No of Systems', str(len(output)), "Total Power: " + str(power_consume), "", "", "", ""])
+        return output
+
+    async def async_get_chassis_inventory(self, ctx) -> (bool, list):
+        """
+        Method to get chassis inventory.
+        :param ctx: HostContext of the host.
+        :return: Bool,List of Chassis inventory.
+        """
+        try:
+            chassis_inv = []
+            bool_resp, chassis = await self.async_get_chassis_members(ctx)
+            if bool_resp == False:
+                raise Exception("Failed")
+            for chassis_x_url, response_chassis_x_url in chassis:
+                chassis_inv.append({key: value for key, value in response_chassis_x_url.dict.items()
+                                    if key not in CHASSIS_EXCLUDED_KEYS})
+            return True, chassis_inv
+        except Exception as e:
+            logger.error("error msg: {}".format(e))
+            return False, chassis_inv
+
+    async def async_get_thermal_inventory(self, ctx, thermal_key):
+        """
+        Method to get "Temperatures" or "Fans" entries of all system chassis.
+        :param ctx: HostContext of the host.
+        :param thermal_key: "Temperatures" or "Fans"
+        :return: Bool, list of entries
+        """
+        try:
+            bool_resp, chassis = await self.async_get_chassis_members(ctx)
+            if bool_resp == False:
+                raise Exception("Failed")
+            thermal_urls = []
+            for chassis_x_url, member_response in chassis:
+                # if chassis is not normal skip it
+                if "Thermal" not in member_response.dict:
+                    continue
+                if len(chassis) > 1 and ("Links" not in member_response.dict or
+                                         "ComputerSystems" not in member_response.dict["Links"]):
+                    continue
+                thermal_urls.append(member_response.dict["Thermal"]["@odata.id"])
+            responses = await asyncio.gather(*[self.async_redfish_response(ctx, "get", url) for url in thermal_urls])
+            inventory = []
+            for bool_resp3, response_thermal_url in responses:
+                if bool_resp3 == False:
+                    raise Exception("Failed")
+                for dic_item in response_thermal_url.dict[thermal_key]:
+                    inventory.append({key: value for key, value in dic_item.items()
+                                      if key not in ["@odata.id", "RelatedItem"]})
+            return True, inventory
+        except Exception as e:
+            logger.error("error_msg: {}".format(e))
+            return False, None
+
+    async def async_get_temperatures_inventory(self, ctx):
+        """
+        Method to get temperature inventory.
+        :param ctx: HostContext of the host.
+        :return: Bool,Temperature inventory.
+        """
+        return await self.async_get_thermal_inventory(ctx, "Temperatures")
+
+    async def async_get_fans_inventory(self, ctx):
+        """
+        Method to get fans inventory from chassis.
+        :param ctx: HostContext of the host.
+        :return: Bool,list of fans inventory.
+        """
+        return await self.async_get_thermal_inventory(ctx, "Fans")
+
+    async def async_get_psu_inventory(self, ctx):
+        """
+        Method to get power supply unit inventory.
+        :param ctx: HostContext of the host.
+        :return: Bool, list of psu inventory.
+        """
+        try:
+            bool_resp, chassis = await self.async_get_chassis_members(ctx)
+            if bool_resp == False:
+                raise Exception("Failed")
+            power_urls = [response.dict["Power"]["@odata.id"] for url, response in chassis
+                          if "Power" in response.dict]
+            responses = await asyncio.gather(*[self.async_redfish_response(ctx, "get", url) for url in power_urls])
+            psu_inv_list = []
+            for bool_respx, response_power_url in responses:
+                if bool_respx == False:
+                    raise Exception("Failed")
+                for psu in response_power_url.dict.get("PowerSupplies", []):
+                    psu_inv_list.append({key: value for key, value in psu.items() if key in PSU_KEYS})
+            return True, psu_inv_list
+        except Exception as e:
+            logger.error("error msg: {}".format(e))
+            return False, None
+
+    async def async_get_inventory_member(self, ctx, url):
+        """
+        Method to get one drive or volume without its link and odata keys.
+        :param ctx: HostContext of the host.
+        :param url: drive or volume url
+        :return: dict of inventory attributes
+        """
+        bool_resp, response = await self.async_redfish_response(ctx, "get", url)
+        if bool_resp == False:
+            raise Exception("Failed")
+        return {key: value for key, value in response.dict.items() if key not in INVENTORY_EXCLUDED_KEYS}
+
+    async def async_get_storage(self, ctx, storage_i_url):
+        """
+        Method to get one storage resource with its drives, volumes and storage controllers.
+        :param ctx: HostContext of the host.
+        :param storage_i_url: storage resource url
+        :return: dict in the format of RedfishApi.get_storage_inventory entries
+        """
+        bool_resp4, response_storage_i_url = await self.async_redfish_response(ctx, "get", storage_i_url)
+        if bool_resp4 == False:
+            raise Exception("Failed")
+        storage_dict = response_storage_i_url.dict
+        storage = {"Id": storage_dict["Id"], "Name": storage_dict["Name"]}
+        drive_urls = [member["@odata.id"] for member in storage_dict.get("Drives", [])]
+        volume_urls = []
+        if "Volumes" in storage_dict:
+            bool_resp6, volume_urls = await self.async_get_member_urls(ctx, storage_dict["Volumes"]["@odata.id"])
+            if bool_resp6 == False:
+                raise Exception("Failed")
+        members = await asyncio.gather(*[self.async_get_inventory_member(ctx, url)
+                                         for url in drive_urls + volume_urls])
+        storage["Devices"] = members[:len(drive_urls)]
+        storage["Volumes"] = members[len(drive_urls):]
+        storage["Storage Controllers"] = [
+            {key: value for key, value in controller.items() if key not in INVENTORY_EXCLUDED_KEYS}
+            for controller in storage_dict.get("StorageControllers", [])]
+        return storage
+
+    async def async_get_storage_inventory(self, ctx) -> (bool, list):
+        """
+        Method to get storage inventory
+        :param ctx: HostContext of the host.
+        :return: Bool,list of storage controllers, drives and volumes.
+        """
+        try:
+            storage_details = []
+            bool_resp, system = await self.async_get_system_urls(ctx)
+            if bool_resp == False:
+                raise Exception("System url list is empty.")
+            for system_x_url in system:
+                bool_resp2, response_system_x_url = await self.async_redfish_response(ctx, "get", system_x_url)
+                if bool_resp2 == False:
+                    raise Exception("Failed")
+                if "Storage" in response_system_x_url.dict:
+                    storage_url = response_system_x_url.dict["Storage"]["@odata.id"]
+                else:
+                    storage_url = response_system_x_url.dict["SimpleStorage"]["@odata.id"]
+                bool_resp3, storage_urls = await self.async_get_member_urls(ctx, storage_url)
+                if bool_resp3 == False:
+                    raise Exception("Failed")
+                storage_details.extend(await asyncio.gather(*[self.async_get_storage(ctx, url)
+                                                              for url in storage_urls]))
+            return True, storage_details
+        except Exception as e:
+            logger.error("error_msg: {}".format(e))
+            return False, storage_details
@@ -0,0 +1,130 @@
+#Copyright (c) 2024 Samsung Electronics Corporation
+#SPDX-License-Identifier: BSD-3-Clause
+
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../lib")))
+import logger as logging
+
+logger = logging.get_logger(__name__)
+
+IDENTITY_FIELDS = ["redfish_version", "oem_vendor", "system_manufacturer", "system_model", "system_urls",
+                   "chassis_urls", "manager_urls", "protocol_features", "reset_targets",
+                   "metric_report_url"]
+
+
+class DiscoveryCache:
+    """
+    Discovered identity of every host (RedfishVersion, OEM vendor, manufacturer, model, the system, chassis and
+    manager urls, the supported query parameters and the reset action targets) stored in a JSON file keyed by host.
+    Entries expire after ttl seconds; an expired entry is still reused when the service root ETag did not change.
+    Changes made inside batch() are written to the file once, when the outermost batch ends.
+    """
+
+    def __init__(self, path, ttl=86400):
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._batches = 0
+        self._dirty = False
+        if os.path.exists(path):
+            try:
+                with open(path) as cache_file:
+                    self._entries = json.load(cache_file)
+            except Exception as e:
+                logger.error("discovery cache {} is not readable and will be rebuilt, error msg: {}".format(path, e))
+
+    def get(self, login_host):
+        """
+        Method to get the cached entry of a host.
+        :param login_host: host ip or name.
+        :return: dict entry or None
+        """
+        return self._entries.get(login_host)
+
+    def is_fresh(self, entry):
+        """
+        Method to check the TTL of an entry.
+        :param entry: dict entry returned by get()
+        :return: Bool
+        """
+        return entry is not None and time.time() - entry["timestamp"] < self.ttl
+
+    def put(self, login_host, entry):
+        """
+        Method to store the entry of a host and write the cache file.
+        :param login_host: host ip or name.
+        :param entry: dict with IDENTITY_FIELDS and "etag" of the service root.
+        :return: None
+        """
+        with self._lock:
+            entry["timestamp"] = time.time()
+            self._entries[login_host] = entry
+            self._save()
+
+    def update(self, login_host, field, value):
+        """
+        Method to change one field of the entry of a host without restarting its TTL.
+        :param login_host: host ip or name.
+        :param field: one of IDENTITY_FIELDS
+        :param value: new value
+        :return: None
+        """
+        with self._lock:
+            if login_host in self._entries:
+                self._entries[login_host][field] = value
+                self._save()
+
+    def touch(self, login_host):
+        """
+        Method to restart the TTL of an entry whose service root ETag is unchanged.
+        :param login_host: host ip or name.
+        :return: None
+        """
+        with self._lock:
+            self._entries[login_host]["timestamp"] = time.time()
+            self._save()
+
+    def invalidate(self, login_host):
+        """
+        Method to drop the entry of a host.
+        :param login_host: host ip or name.
+        :return: None
+        """
+        with self._lock:
+            if self._entries.pop(login_host, None) is not None:
+                self._save()
+
+    @contextmanager
+    def batch(self):
+        """
+        Method to defer writing the cache file until the end of a with-block, i.e a discovery pass over the fleet.
+        """
+        with self._lock:
+            self._batches += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._batches -= 1
+                if self._batches == 0 and self._dirty:
+                    self._write()
+
+    def _save(self):
+        if self._batches:
+            self._dirty = True
+        else:
+            self._write()
+
+    def _write(self):
+        self._dirty = False
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as cache_file:
+            json.dump(self._entries, cache_file, indent=2)
+        os.replace(tmp_path, self.path)
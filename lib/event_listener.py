@@ -0,0 +1,194 @@
+#Copyright (c) 2024 Samsung Electronics Corporation
+#SPDX-License-Identifier: BSD-3-Clause
+
+import json
+import os
+import ssl
+import sys
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../lib")))
+import logger as logging
+
+logger = logging.get_logger(__name__)
+
+MAX_BODY = 4 * 1024 * 1024
+
+
+class EventServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # BMCs of a whole fleet post at once after a power event
+    request_queue_size = 1024
+
+
+class ReceivedEvent:
+    __slots__ = ("sender", "kind", "context", "data", "received_at")
+
+    def __init__(self, sender, kind, context, data, received_at):
+        self.sender = sender
+        self.kind = kind
+        self.context = context
+        self.data = data
+        self.received_at = received_at
+
+
+class EventDispatcher:
+    """
+    Hands every EventRecord of an Event and every MetricReport to the subscribed callbacks and to the queue as a
+    ReceivedEvent; records a BMC sends again (same EventId, or same report Id and Timestamp or ReportSequence) are
+    dropped while they are among the last dedup_size records received.
+    Callbacks run in the thread (or event loop) delivering the event and should return quickly, slow consumers
+    should read the queue.
+    """
+
+    def __init__(self, dedup_size=10000, queue=None):
+        """
+        :param dedup_size: number of event ids remembered for de-duplication.
+        :param queue: queue.Queue receiving the ReceivedEvents, optional.
+        """
+        self.dedup_size = dedup_size
+        self.queue = queue
+        self.received = 0
+        self.duplicates = 0
+        self._callbacks = []
+        self._seen = OrderedDict()
+        self._lock = threading.Lock()
+
+    def subscribe(self, callback, kind=None):
+        """
+        Method to register a callback for received events.
+        :param callback: callable(ReceivedEvent)
+        :param kind: "Event" or "MetricReport", None for both.
+        :return: None
+        """
+        with self._lock:
+            self._callbacks.append((callback, kind))
+
+    def handle(self, sender, payload):
+        """
+        Method to parse an Event or MetricReport payload and dispatch its records.
+        :param sender: address or login host of the BMC.
+        :param payload: Event or MetricReport dict.
+        :return: number of records dispatched
+        """
+        received_at = time.time()
+        context = payload.get("Context")
+        if "Events" in payload:
+            records = [("Event", record, record.get("EventId")) for record in payload["Events"]]
+        elif "MetricValues" in payload or "MetricReport" in payload.get("@odata.type", ""):
+            sequence = payload.get("Timestamp", payload.get("ReportSequence"))
+            # a report without Timestamp and ReportSequence can't be told from a resend, it is never dropped
+            records = [("MetricReport", payload,
+                        "{}@{}".format(payload.get("Id"), sequence) if sequence is not None else None)]
+        else:
+            raise ValueError("neither an Event nor a MetricReport")
+        dispatched = 0
+        for kind, record, event_id in records:
+            if event_id is not None and self._is_duplicate((sender, kind, event_id)):
+                continue
+            event = ReceivedEvent(sender, kind, record.get("Context", context), record, received_at)
+            with self._lock:
+                callbacks = list(self._callbacks)
+            for callback, callback_kind in callbacks:
+                if callback_kind is None or callback_kind == kind:
+                    try:
+                        callback(event)
+                    except Exception as e:
+                        logger.error("event callback failed, error msg: {}".format(e))
+            if self.queue is not None:
+                self.queue.put(event)
+            dispatched += 1
+        return dispatched
+
+    def _is_duplicate(self, key):
+        with self._lock:
+            self.received += 1
+            if key in self._seen:
+                self._seen.move_to_end(key)
+                self.duplicates += 1
+                return True
+            self._seen[key] = None
+            while len(self._seen) > self.dedup_size:
+                self._seen.popitem(last=False)
+            return False
+
+
+class EventListener(EventDispatcher):
+    """
+    HTTP(S) endpoint receiving the Event and MetricReport POSTs of the subscriptions of many BMCs at once, one
+    thread per connection, dispatched as by EventDispatcher.
+    """
+
+    def __init__(self, host="0.0.0.0", port=8443, certfile=None, keyfile=None, dedup_size=10000, queue=None):
+        """
+        :param host: address to listen on.
+        :param port: port to listen on, 0 picks a free port.
+        :param certfile: PEM certificate, serves HTTPS when set.
+        :param keyfile: PEM private key of certfile, default the key is in certfile.
+        :param dedup_size: number of event ids remembered for de-duplication.
+        :param queue: queue.Queue receiving the ReceivedEvents, optional.
+        """
+        super().__init__(dedup_size=dedup_size, queue=queue)
+        self._thread = None
+        self._server = EventServer((host, port), self._handler())
+        self.scheme = "http"
+        if certfile:
+            ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            ssl_context.load_cert_chain(certfile, keyfile or None)
+            # the handshake runs in the connection thread, a slow BMC doesn't hold up accepting others
+            self._server.socket = ssl_context.wrap_socket(self._server.socket, server_side=True,
+                                                          do_handshake_on_connect=False)
+            self.scheme = "https"
+
+    @property
+    def port(self):
+        return self._server.server_address[1]
+
+    def start(self):
+        """
+        Method to serve in a daemon thread.
+        :return: None
+        """
+        self._thread = threading.Thread(target=self._server.serve_forever, name="event-listener", daemon=True)
+        self._thread.start()
+        logger.info("listening for redfish events on {}://{}:{}".format(self.scheme, *self._server.server_address))
+
+    def stop(self):
+        """
+        Method to stop serving and close the socket.
+        :return: None
+        """
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def _handler(self):
+        listener = self
+
+        class EventHandler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                try:
+                    length = int(self.headers.get("Content-Length", 0))
+                    if length <= 0 or length > MAX_BODY:
+                        raise ValueError("invalid Content-Length {}".format(length))
+                    payload = json.loads(self.rfile.read(length))
+                    if not isinstance(payload, dict):
+                        raise ValueError("payload is not an object")
+                    listener.handle(self.client_address[0], payload)
+                except Exception as e:
+                    logger.error("bad event from {}, error msg: {}".format(self.client_address[0], e))
+                    self.send_response(400)
+                else:
+                    self.send_response(204)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                pass
+
+        return EventHandler
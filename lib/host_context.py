@@ -0,0 +1,69 @@
+#Copyright (c) 2024 Samsung Electronics Corporation
+#SPDX-License-Identifier: BSD-3-Clause
+
+import functools
+
+
+class HostContext:
+    """
+    Per-host state used by RedfishApi methods: redfish client, discovered identity and HTML report buffer.
+    One context is created for every configured system so that hosts can be processed concurrently.
+    """
+    __slots__ = ("login_host", "client", "redfish_version", "oem_vendor", "system_manufacturer", "system_model",
+                 "system_urls", "chassis_urls", "manager_urls", "protocol_features", "reset_targets",
+                 "metric_report_url", "metric_report", "resource_cache", "power_transition_time", "html_results")
+
+    def __init__(self, login_host=None, client=None):
+        self.login_host = login_host
+        self.client = client
+        self.redfish_version = None
+        self.oem_vendor = None
+        self.system_manufacturer = None
+        self.system_model = None
+        self.system_urls = None
+        self.chassis_urls = None
+        self.manager_urls = None
+        self.protocol_features = None
+        self.reset_targets = None
+        self.metric_report_url = None
+        self.metric_report = None
+        self.resource_cache = None
+        self.power_transition_time = None
+        self.html_results = ""
+
+    def fork(self):
+        """
+        Method to create a context for the same host with an empty report buffer.
+        The resource cache is shared with the parent context.
+        :return: HostContext
+        """
+        child = HostContext(self.login_host, self.client)
+        for slot in self.__slots__:
+            if slot != "html_results":
+                setattr(child, slot, getattr(self, slot))
+        return child
+
+    def drain_report(self):
+        """
+        Method to take the collected HTML report rows out of the context.
+        :return: HTML rows collected since the last drain
+        """
+        html_results, self.html_results = self.html_results, ""
+        return html_results
+
+    def __repr__(self):
+        return "HostContext({})".format(self.login_host)
+
+
+def bind_context(method):
+    """
+    Decorator for RedfishApi methods that makes them accept an explicit "ctx=HostContext" keyword argument.
+    The method then runs against that host instead of the api object's default context.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, ctx=None, **kwargs):
+        if ctx is None:
+            return method(self, *args, **kwargs)
+        with self.use_context(ctx):
+            return method(self, *args, **kwargs)
+    return wrapper
@@ -0,0 +1,74 @@
+#Copyright (c) 2024 Samsung Electronics Corporation
+#SPDX-License-Identifier: BSD-3-Clause
+
+import json
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../lib")))
+import logger as logging
+
+logger = logging.get_logger(__name__)
+
+
+class LogCheckpoints:
+    """
+    Position of the incremental BMC log reader per host and log service, stored in a JSON file.
+    A checkpoint is the Created time of the newest entry read and the Ids of the entries with that time, so entries
+    sharing the timestamp are neither read twice nor lost, plus the Members@odata.count of the log and the highest
+    numeric entry Id read ("count", "last_id") to order entries without Created and to notice a cleared log.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._checkpoints = {}
+        if os.path.exists(path):
+            try:
+                with open(path) as checkpoint_file:
+                    self._checkpoints = json.load(checkpoint_file)
+            except Exception as e:
+                logger.error("log checkpoints {} are not readable, logs are read from the start, error msg: {}".format(
+                    path, e))
+
+    def get(self, login_host, log_service):
+        """
+        Method to get the checkpoint of a log service.
+        :param login_host: host ip or name.
+        :param log_service: log service url
+        :return: dict with "created", "ids", "count" and "last_id", or None before the first read.
+        """
+        return self._checkpoints.get(login_host, {}).get(log_service)
+
+    def put(self, login_host, log_service, checkpoint):
+        """
+        Method to store the checkpoint of a log service and write the file.
+        :param login_host: host ip or name.
+        :param log_service: log service url
+        :param checkpoint: dict with "created", "ids", "count" and "last_id"
+        :return: None
+        """
+        with self._lock:
+            self._checkpoints.setdefault(login_host, {})[log_service] = checkpoint
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w") as checkpoint_file:
+                json.dump(self._checkpoints, checkpoint_file, indent=2)
+            os.replace(tmp_path, self.path)
+
+    def reset(self, login_host, log_service=None):
+        """
+        Method to drop checkpoints so that the logs are read from the start again, i.e after the log was cleared.
+        :param login_host: host ip or name.
+        :param log_service: log service url, None for all log services of the host.
+        :return: None
+        """
+        with self._lock:
+            if log_service is None:
+                self._checkpoints.pop(login_host, None)
+            else:
+                self._checkpoints.get(login_host, {}).pop(log_service, None)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w") as checkpoint_file:
+                json.dump(self._checkpoints, checkpoint_file, indent=2)
+            os.replace(tmp_path, self.path)
@@ -0,0 +1,157 @@
+#Copyright (c) 2024 Samsung Electronics Corporation
+#SPDX-License-Identifier: BSD-3-Clause
+
+import json
+import sqlite3
+import threading
+from datetime import datetime, timezone
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS log_entries (
+    host TEXT NOT NULL,
+    log_service TEXT NOT NULL,
+    entry_id TEXT NOT NULL,
+    created TEXT,
+    created_ts REAL,
+    severity TEXT,
+    message_id TEXT,
+    message TEXT,
+    entry_type TEXT,
+    sensor_type TEXT,
+    entry TEXT,
+    UNIQUE (host, log_service, entry_id)
+);
+CREATE INDEX IF NOT EXISTS log_entries_host ON log_entries (host, created_ts);
+CREATE INDEX IF NOT EXISTS log_entries_created ON log_entries (created_ts);
+CREATE INDEX IF NOT EXISTS log_entries_severity ON log_entries (severity, created_ts);
+CREATE INDEX IF NOT EXISTS log_entries_message_id ON log_entries (message_id, created_ts);
+"""
+
+COLUMNS = ["host", "log_service", "entry_id", "created", "created_ts", "severity", "message_id", "message",
+           "entry_type", "sensor_type", "entry"]
+
+
+def created_timestamp(created):
+    """
+    Method to convert the Created time of a log entry to a UNIX timestamp, times without offset are taken as UTC.
+    :param created: Created value of a log entry
+    :return: float or None
+    """
+    try:
+        created = datetime.fromisoformat(created.replace("Z", "+00:00"))
+    except Exception:
+        return None
+    if created.tzinfo is None:
+        created = created.replace(tzinfo=timezone.utc)
+    return created.timestamp()
+
+
+class LogStore:
+    """
+    SQLite store of BMC log entries of the fleet, indexed on host, Created, Severity and MessageId.
+    An entry is stored once per (host, log service, Id), so re-reading a log only adds new entries.
+    """
+
+    def __init__(self, path, batch_size=1000):
+        self.path = path
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(SCHEMA)
+
+    def ingest(self, login_host, entries):
+        """
+        Method to store log entries, entries already stored are ignored.
+        :param login_host: host ip or name.
+        :param entries: iterable of (log service url, log entry dict), i.e RedfishApi.read_log_entries()
+        :return: number of new entries
+        """
+        inserted = 0
+        batch = []
+        for log_service, entry in entries:
+            batch.append((login_host, log_service, str(entry.get("Id")), entry.get("Created"),
+                          created_timestamp(entry.get("Created")), entry.get("Severity"), entry.get("MessageId"),
+                          entry.get("Message"), entry.get("EntryType"), entry.get("SensorType"), json.dumps(entry)))
+            if len(batch) >= self.batch_size:
+                inserted += self._insert(batch)
+                batch = []
+        if batch:
+            inserted += self._insert(batch)
+        return inserted
+
+    def _insert(self, batch):
+        with self._lock:
+            before = self._connection.total_changes
+            with self._connection:
+                self._connection.executemany(
+                    "INSERT OR IGNORE INTO log_entries ({}) VALUES ({})".format(", ".join(COLUMNS),
+                                                                               ", ".join("?" * len(COLUMNS))), batch)
+            return self._connection.total_changes - before
+
+    def query(self, login_host=None, since=None, until=None, severity=None, message_id=None, sensor_type=None,
+              limit=None):
+        """
+        Method to find log entries, newest first.
+        :param login_host: host ip or name, or a list of them.
+        :param since: UNIX timestamp, entries created at or after it.
+        :param until: UNIX timestamp, entries created before it.
+        :param severity: "OK", "Warning", "Critical" or a list of them.
+        :param message_id: MessageId, with "%" as wildcard (i.e "%PSU%").
+        :param sensor_type: SensorType i.e "Power Supply / Converter".
+        :param limit: maximum number of entries.
+        :return: list of dicts with the columns of the store, "entry" is the full log entry.
+        """
+        where, parameters = self._where(login_host, since, until, severity, message_id, sensor_type)
+        sql = "SELECT {} FROM log_entries{} ORDER BY created_ts DESC".format(", ".join(COLUMNS), where)
+        if limit:
+            sql += " LIMIT ?"
+            parameters.append(limit)
+        with self._lock:
+            rows = self._connection.execute(sql, parameters).fetchall()
+        results = []
+        for row in rows:
+            result = dict(zip(COLUMNS, row))
+            result["entry"] = json.loads(result["entry"])
+            results.append(result)
+        return results
+
+    def count(self, login_host=None, since=None, until=None, severity=None, message_id=None, sensor_type=None):
+        """
+        Method to count log entries, with the filters of query().
+        :return: int
+        """
+        where, parameters = self._where(login_host, since, until, severity, message_id, sensor_type)
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM log_entries" + where, parameters).fetchone()[0]
+
+    def _where(self, login_host, since, until, severity, message_id, sensor_type):
+        conditions, parameters = [], []
+        for column, value in [("host", login_host), ("severity", severity)]:
+            if isinstance(value, (list, tuple)):
+                conditions.append("{} IN ({})".format(column, ", ".join("?" * len(value))))
+                parameters.extend(value)
+            elif value is not None:
+                conditions.append("{} = ?".format(column))
+                parameters.append(value)
+        if since is not None:
+            conditions.append("created_ts >= ?")
+            parameters.append(since)
+        if until is not None:
+            conditions.append("created_ts < ?")
+            parameters.append(until)
+        if message_id is not None:
+            conditions.append("message_id LIKE ?" if "%" in message_id else "message_id = ?")
+            parameters.append(message_id)
+        if sensor_type is not None:
+            conditions.append("sensor_type = ?")
+            parameters.append(sensor_type)
+        return (" WHERE " + " AND ".join(conditions) if conditions else ""), parameters
+
+    def close(self):
+        """
+        Method to close the database.
+        :return: None
+        """
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,89 @@
+#Copyright (c) 2024 Samsung Electronics Corporation
+#SPDX-License-Identifier: BSD-3-Clause
+
+import re
+
+PARAMETER_SEGMENT = re.compile("^{[A-Za-z0-9]+}$")
+PARAMETER = re.compile("{[A-Za-z0-9]+}")
+
+
+class _Node:
+    __slots__ = ("children", "parameter", "patterns", "path")
+
+    def __init__(self):
+        self.children = {}
+        self.parameter = None
+        self.patterns = []
+        self.path = None
+
+
+class OpenApiPathIndex:
+    """
+    Segment trie over the paths of openapi.yaml, built once when the spec is loaded.
+    A lookup walks the uri segments instead of trying a regex for every path of the spec.
+    Segments are literal ("Systems"), a whole parameter ("{ComputerSystemId}") or a mix of both, which is kept
+    as a compiled regex for that segment.
+    """
+
+    def __init__(self, paths=()):
+        self.root = _Node()
+        self.size = 0
+        for path in paths:
+            self.add(path)
+
+    def add(self, path):
+        """
+        Method to add one openapi path to the index.
+        :param path: openapi path i.e /redfish/v1/Systems/{ComputerSystemId}
+        :return: None
+        """
+        node = self.root
+        for segment in path.split("/"):
+            if PARAMETER_SEGMENT.match(segment):
+                if node.parameter is None:
+                    node.parameter = _Node()
+                node = node.parameter
+            elif PARAMETER.search(segment):
+                segment_pattern = "^" + "[^/]+".join(re.escape(part) for part in PARAMETER.split(segment)) + "$"
+                for pattern, child in node.patterns:
+                    if pattern.pattern == segment_pattern:
+                        node = child
+                        break
+                else:
+                    child = _Node()
+                    node.patterns.append((re.compile(segment_pattern), child))
+                    node = child
+            else:
+                node = node.children.setdefault(segment, _Node())
+        if node.path is None:
+            self.size += 1
+            node.path = path
+
+    def match(self, uri):
+        """
+        Method to find the openapi path matching an uri.
+        :param uri: uri to be validated, query parameters are ignored.
+        :return: matching openapi path or None
+        """
+        return self._match(self.root, uri.split("?")[0].split("/"), 0)
+
+    def _match(self, node, segments, position):
+        if position == len(segments):
+            return node.path
+        segment = segments[position]
+        child = node.children.get(segment)
+        if child is not None:
+            path = self._match(child, segments, position + 1)
+            if path is not None:
+                return path
+        for pattern, child in node.patterns:
+            if pattern.match(segment):
+                path = self._match(child, segments, position + 1)
+                if path is not None:
+                    return path
+        if node.parameter is not None and segment:
+            return self._match(node.parameter, segments, position + 1)
+        return None
+
+    def __len__(self):
+        return self.size
@@ -0,0 +1,191 @@
+#Copyright (c) 2024 Samsung Electronics Corporation
+#SPDX-License-Identifier: BSD-3-Clause
+
+import heapq
+import itertools
+import math
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../lib")))
+import logger as logging
+
+logger = logging.get_logger(__name__)
+
+
+class HostSchedule:
+    __slots__ = ("login_host", "interval", "polls", "overruns", "skipped", "triggered", "last_lag", "max_lag",
+                 "total_lag", "last_watts", "generation", "running", "poll_again")
+
+    def __init__(self, login_host, interval):
+        self.login_host = login_host
+        self.interval = interval
+        self.polls = 0
+        self.overruns = 0
+        self.skipped = 0
+        self.triggered = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self.total_lag = 0.0
+        self.last_watts = None
+        self.generation = 0
+        self.running = False
+        self.poll_again = False
+
+    def stats(self):
+        """
+        Method to get the counters of the host.
+        :return: dict
+        """
+        return {"interval": self.interval, "polls": self.polls, "overruns": self.overruns, "skipped": self.skipped,
+                "triggered": self.triggered, "last_lag": self.last_lag, "max_lag": self.max_lag,
+                "mean_lag": self.total_lag / self.polls if self.polls else 0.0, "last_watts": self.last_watts}
+
+
+class PollScheduler:
+    """
+    Polls every host on its own interval. The next poll of a host is due one interval (randomized by +-jitter) after
+    the previous one was due, so sampling doesn't drift; hosts whose last power was at or above
+    near_threshold * threshold are polled every fast_interval instead.
+    A host is never polled twice at once: when a poll takes longer than the interval the missed ticks are skipped
+    and counted as an overrun instead of being queued. Lag is the delay between the due time and the poll start.
+    poll_now() polls a host out of turn (i.e on a redfish event) and restarts its interval from there.
+    """
+
+    def __init__(self, poll, interval, jitter=0.1, fast_interval=None, threshold=None, near_threshold=0.9,
+                 workers=16):
+        """
+        :param poll: callable(login_host) returning the current watts of the host or None.
+        :param interval: default seconds between two polls of a host.
+        :param jitter: fraction of the interval the due time is randomized by.
+        :param fast_interval: seconds between polls of a host near the threshold, None disables it.
+        :param threshold: power threshold in watts.
+        :param near_threshold: fraction of the threshold from which a host counts as near it.
+        :param workers: number of polls running at once.
+        """
+        self.poll = poll
+        self.interval = interval
+        self.jitter = jitter
+        self.fast_interval = fast_interval
+        self.threshold = threshold
+        self.near_threshold = near_threshold
+        self.hosts = {}
+        self._heap = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._stopped = False
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="poll")
+
+    def add_host(self, login_host, interval=None):
+        """
+        Method to start polling a host. The first poll is spread randomly over one interval.
+        :param login_host: host ip or name.
+        :param interval: seconds between polls of this host, default the scheduler interval.
+        :return: None
+        """
+        host = HostSchedule(login_host, interval or self.interval)
+        with self._condition:
+            self.hosts[login_host] = host
+            self._push(time.time() + random.uniform(0, host.interval), host)
+
+    def poll_now(self, login_host):
+        """
+        Method to poll a host as soon as possible, a host being polled is polled again when it finishes.
+        :param login_host: host ip or name.
+        :return: None
+        """
+        with self._condition:
+            host = self.hosts.get(login_host)
+            if host is None or self._stopped:
+                return
+            host.triggered += 1
+            if host.running:
+                host.poll_again = True
+            else:
+                host.generation += 1
+                self._push(time.time(), host)
+
+    def run(self):
+        """
+        Method to run the scheduler in the calling thread until stop() is called.
+        :return: None
+        """
+        with self._condition:
+            while not self._stopped:
+                now = time.time()
+                if not self._heap or self._heap[0][0] > now:
+                    self._condition.wait(self._heap[0][0] - now if self._heap else None)
+                    continue
+                due, sequence, host, generation = heapq.heappop(self._heap)
+                if generation != host.generation:
+                    # replaced by poll_now()
+                    continue
+                host.running = True
+                self._executor.submit(self._poll, host, due)
+        self._executor.shutdown(wait=True)
+
+    def stop(self):
+        """
+        Method to stop the scheduler, polls already running are finished.
+        :return: None
+        """
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+
+    def stats(self):
+        """
+        Method to get the lag and overrun counters of all hosts and of the fleet.
+        :return: dict with "hosts" (per host counters), "polls", "overruns", "skipped", "triggered" and "max_lag"
+        """
+        with self._condition:
+            hosts = {login_host: host.stats() for login_host, host in self.hosts.items()}
+        return {"hosts": hosts,
+                "polls": sum(host["polls"] for host in hosts.values()),
+                "overruns": sum(host["overruns"] for host in hosts.values()),
+                "skipped": sum(host["skipped"] for host in hosts.values()),
+                "triggered": sum(host["triggered"] for host in hosts.values()),
+                "max_lag": max([host["max_lag"] for host in hosts.values()], default=0.0)}
+
+    def _push(self, due, host):
+        heapq.heappush(self._heap, (due, next(self._sequence), host, host.generation))
+        self._condition.notify()
+
+    def _next_interval(self, host):
+        if (self.fast_interval and self.threshold and host.last_watts is not None
+                and host.last_watts >= self.threshold * self.near_threshold):
+            return min(self.fast_interval, host.interval)
+        return host.interval
+
+    def _poll(self, host, due):
+        lag = max(time.time() - due, 0.0)
+        try:
+            watts = self.poll(host.login_host)
+        except Exception as e:
+            logger.error("polling {} failed, error msg: {}".format(host.login_host, e))
+            watts = None
+        with self._condition:
+            host.polls += 1
+            host.last_lag = lag
+            host.max_lag = max(host.max_lag, lag)
+            host.total_lag += lag
+            host.last_watts = watts
+            interval = self._next_interval(host)
+            next_due = due + interval * (1 + random.uniform(-self.jitter, self.jitter))
+            now = time.time()
+            host.running = False
+            if host.poll_again:
+                host.poll_again = False
+                next_due = now
+            elif next_due <= now:
+                missed = math.ceil((now - next_due) / interval)
+                host.overruns += 1
+                host.skipped += missed
+                next_due += missed * interval
+                logger.info("polling {} overran its interval, skipping {} tick(s)".format(host.login_host, missed))
+            if not self._stopped:
+                self._push(next_due, host)
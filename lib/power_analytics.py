@@ -0,0 +1,165 @@
+#Copyright (c) 2024 Samsung Electronics Corporation
+#SPDX-License-Identifier: BSD-3-Clause
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../lib")))
+from power_store import RECORD
+
+# numpy view of power_store.RECORD
+SAMPLE_DTYPE = np.dtype([("timestamp", "<f8"), ("host", "<u4"), ("current", "<f4"), ("average", "<f4"),
+                         ("max", "<f4"), ("min", "<f4")])
+assert SAMPLE_DTYPE.itemsize == RECORD.size
+
+
+class PowerAnalytics:
+    """
+    Fleet power statistics over the samples of a PowerStore. Records are read as one numpy structured array and
+    every statistic is computed with array operations, N/A samples (NaN) are left out.
+    """
+
+    def __init__(self, store):
+        self.store = store
+
+    def samples(self, start=None, end=None):
+        """
+        Method to get the samples between start (inclusive) and end (exclusive).
+        :param start: time.time() value, None for no lower bound.
+        :param end: time.time() value, None for no upper bound.
+        :return: numpy array of SAMPLE_DTYPE
+        """
+        return np.frombuffer(self.store.read_bytes(start, end), dtype=SAMPLE_DTYPE)
+
+    def host_series(self, login_host, start=None, end=None, field="current"):
+        """
+        Method to get the power of one host over time.
+        :param login_host: host ip or name.
+        :param start: time.time() value, None for no lower bound.
+        :param end: time.time() value, None for no upper bound.
+        :param field: "current", "average", "max" or "min"
+        :return: timestamps, watts (numpy arrays)
+        """
+        samples = self.samples(start, end)
+        host_id = self.store.hosts().get(login_host)
+        samples = samples[samples["host"] == host_id] if host_id is not None else samples[:0]
+        return samples["timestamp"], samples[field].astype(np.float64)
+
+    def rolling_average(self, login_host, window, start=None, end=None):
+        """
+        Method to get the rolling average power of one host over the last window samples.
+        :param login_host: host ip or name.
+        :param window: number of samples per average, at least 1. Until window samples are there the average is
+                       over the samples so far.
+        :param start: time.time() value, None for no lower bound.
+        :param end: time.time() value, None for no upper bound.
+        :return: timestamps, averages (numpy arrays), NaN where the window holds no valid sample.
+        """
+        if window < 1:
+            raise ValueError("window must be at least 1, got {}".format(window))
+        timestamps, watts = self.host_series(login_host, start, end)
+        valid = ~np.isnan(watts)
+        sums = np.cumsum(np.where(valid, watts, 0.0))
+        counts = np.cumsum(valid)
+        sums[window:] = sums[window:] - sums[:-window]
+        counts[window:] = counts[window:] - counts[:-window]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return timestamps, np.where(counts > 0, sums / counts, np.nan)
+
+    def fleet_draw(self, interval, start=None, end=None):
+        """
+        Method to get the total power of the fleet per polling cycle. Hosts are polled at different times within a
+        cycle, so samples are grouped by floor(timestamp / interval) and the last valid sample of every host in
+        a cycle counts.
+        :param interval: polling interval in seconds.
+        :param start: time.time() value, None for no lower bound.
+        :param end: time.time() value, None for no upper bound.
+        :return: cycle start timestamps, fleet watts (numpy arrays)
+        """
+        samples = self.samples(start, end)
+        watts = samples["current"].astype(np.float64)
+        valid = ~np.isnan(watts)
+        samples, watts = samples[valid], watts[valid]
+        if len(samples) == 0:
+            return np.empty(0), np.empty(0)
+        buckets = np.floor(samples["timestamp"] / interval).astype(np.int64)
+        keys = buckets * (int(samples["host"].max()) + 1) + samples["host"]
+        # samples are in time order, the first occurrence in the reversed keys is the last sample of a host
+        keys, first = np.unique(keys[::-1], return_index=True)
+        last = len(samples) - 1 - first
+        cycles, cycle_index = np.unique(buckets[last], return_inverse=True)
+        totals = np.bincount(cycle_index, weights=watts[last], minlength=len(cycles))
+        return cycles * float(interval), totals
+
+    def fleet_percentile(self, percentile, interval, start=None, end=None):
+        """
+        Method to get a percentile of the fleet power per polling cycle, i.e the p99 fleet draw of a week.
+        :param percentile: 0-100, or a list of them.
+        :param interval: polling interval in seconds.
+        :param start: time.time() value, None for no lower bound.
+        :param end: time.time() value, None for no upper bound.
+        :return: watts, NaN when there are no samples.
+        """
+        cycles, totals = self.fleet_draw(interval, start, end)
+        if len(totals) == 0:
+            return np.full(np.shape(percentile), np.nan) if np.ndim(percentile) else np.nan
+        return np.percentile(totals, percentile)
+
+    def fleet_totals(self, interval, start=None, end=None):
+        """
+        Method to get the fleet power per time interval: the mean power of every host in the interval, summed.
+        :param interval: interval length in seconds.
+        :param start: time.time() value, None starts at the first sample.
+        :param end: time.time() value, None for no upper bound.
+        :return: interval start timestamps, fleet watts (numpy arrays)
+        """
+        samples = self.samples(start, end)
+        if len(samples) == 0:
+            return np.empty(0), np.empty(0)
+        origin = samples["timestamp"][0] if start is None else start
+        buckets = ((samples["timestamp"] - origin) // interval).astype(np.int64)
+        hosts = int(samples["host"].max()) + 1
+        keys = buckets * hosts + samples["host"]
+        watts = samples["current"].astype(np.float64)
+        valid = ~np.isnan(watts)
+        size = (int(buckets[-1]) + 1) * hosts
+        sums = np.bincount(keys, weights=np.where(valid, watts, 0.0), minlength=size).reshape(-1, hosts)
+        counts = np.bincount(keys, weights=valid, minlength=size).reshape(-1, hosts)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = np.where(counts > 0, sums / counts, 0.0)
+        return origin + np.arange(means.shape[0]) * interval, means.sum(axis=1)
+
+    def host_peaks(self, start=None, end=None):
+        """
+        Method to get the highest current power of every host.
+        :param start: time.time() value, None for no lower bound.
+        :param end: time.time() value, None for no upper bound.
+        :return: dict login_host: (timestamp, watts) of the first sample at the peak.
+        """
+        samples = self.samples(start, end)
+        watts = samples["current"].astype(np.float64)
+        valid = ~np.isnan(watts)
+        samples, watts = samples[valid], watts[valid]
+        if len(samples) == 0:
+            return {}
+        peaks = np.full(int(samples["host"].max()) + 1, -np.inf)
+        np.maximum.at(peaks, samples["host"], watts)
+        at_peak = np.flatnonzero(watts == peaks[samples["host"]])
+        hosts, first = np.unique(samples["host"][at_peak], return_index=True)
+        return {self.store.host_name(int(host)): (float(samples["timestamp"][at_peak[index]]),
+                                                  float(watts[at_peak[index]]))
+                for host, index in zip(hosts, first)}
+
+    def threshold_violations(self, threshold, start=None, end=None):
+        """
+        Method to count the samples of every host at or above a power threshold.
+        :param threshold: watts, i.e config "power_threshold".
+        :param start: time.time() value, None for no lower bound.
+        :param end: time.time() value, None for no upper bound.
+        :return: dict login_host: number of samples, hosts without violation are left out.
+        """
+        samples = self.samples(start, end)
+        counts = np.bincount(samples["host"][samples["current"] >= threshold])
+        return {self.store.host_name(host): int(count) for host, count in enumerate(counts) if count}
@@ -0,0 +1,288 @@
+#Copyright (c) 2024 Samsung Electronics Corporation
+#SPDX-License-Identifier: BSD-3-Clause
+
+import csv
+import json
+import math
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../lib")))
+import logger as logging
+
+logger = logging.get_logger(__name__)
+
+# timestamp (f8), host id (u4), current, average, max and min watts (f4), little endian without padding
+RECORD = struct.Struct("<dIffff")
+FIELDS = ["timestamp", "host", "current", "average", "max", "min"]
+SEGMENT_SUFFIX = ".pwr"
+# marker next to a segment that got a record older than the one before it
+UNSORTED_SUFFIX = ".unsorted"
+HOSTS_FILE = "hosts.json"
+
+
+def to_watts(value):
+    """
+    Method to convert a power value of a power usage row to float, "N/A" and missing values become NaN.
+    :param value: watts as int/float or anything else
+    :return: float
+    """
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    return math.nan
+
+
+def sort_records(data):
+    """
+    Method to order packed RECORDs by timestamp, records with the same timestamp keep their order.
+    :param data: bytes of packed RECORDs
+    :return: bytes of packed RECORDs
+    """
+    return b"".join(RECORD.pack(*record) for record in sorted(RECORD.iter_unpack(data), key=lambda record: record[0]))
+
+
+class PowerStore:
+    """
+    Append-only store of power samples in fixed width binary records (RECORD), one segment file per
+    segment_seconds (one day by default) named by the segment start time. Records are stored with the timestamp
+    they are given: a segment that got a record out of time order (a poll that finished after a later one) is
+    marked unsorted, sorted when reading and rewritten in time order once the store moves to the next segment.
+    Time range reads only open the overlapping segments and binary search them through mmap.
+    Host names are mapped to ids in hosts.json of the store directory.
+    """
+
+    def __init__(self, path, segment_seconds=86400):
+        self.path = path
+        self.segment_seconds = segment_seconds
+        self._lock = threading.Lock()
+        self._segment_start = None
+        self._segment_file = None
+        self._last_timestamp = None
+        os.makedirs(path, exist_ok=True)
+        self._hosts = {}
+        hosts_path = os.path.join(path, HOSTS_FILE)
+        if os.path.exists(hosts_path):
+            with open(hosts_path) as hosts_file:
+                self._hosts = json.load(hosts_file)
+        self._host_names = {host_id: login_host for login_host, host_id in self._hosts.items()}
+
+    def host_id(self, login_host):
+        """
+        Method to get the id of a host, a new host gets the next free id.
+        :param login_host: host ip or name.
+        :return: int
+        """
+        with self._lock:
+            return self._host_id(login_host)
+
+    def _host_id(self, login_host):
+        if login_host not in self._hosts:
+            host_id = len(self._hosts)
+            self._hosts[login_host] = host_id
+            self._host_names[host_id] = login_host
+            tmp_path = os.path.join(self.path, HOSTS_FILE + ".tmp")
+            with open(tmp_path, "w") as hosts_file:
+                json.dump(self._hosts, hosts_file, indent=2)
+            os.replace(tmp_path, os.path.join(self.path, HOSTS_FILE))
+        return self._hosts[login_host]
+
+    def host_name(self, host_id):
+        """
+        Method to get the host of an id.
+        :param host_id: int
+        :return: host ip or name, or None for an unknown id.
+        """
+        return self._host_names.get(host_id)
+
+    def hosts(self):
+        """
+        Method to get the host to id mapping.
+        :return: dict
+        """
+        return dict(self._hosts)
+
+    def append(self, timestamp, samples):
+        """
+        Method to store the power samples of one polling cycle.
+        A timestamp older than the newest stored record (a poll that finished after a later one) is stored as the
+        newest timestamp, so the records of a segment stay in time order.
+        :param timestamp: time.time() value of the cycle.
+        :param samples: list of (login_host, current, average, max, min), watts that are not numbers are stored as NaN.
+        :return: None
+        """
+        with self._lock:
+            segment_file = self._segment(timestamp)
+            if self._last_timestamp is not None and timestamp < self._last_timestamp:
+                unsorted_path = segment_file.name + UNSORTED_SUFFIX
+                if not os.path.exists(unsorted_path):
+                    open(unsorted_path, "w").close()
+            data = b"".join(RECORD.pack(timestamp, self._host_id(login_host), *[to_watts(value) for value in watts])
+                            for login_host, *watts in samples)
+            segment_file.write(data)
+            segment_file.flush()
+            self._last_timestamp = max(timestamp, self._last_timestamp or timestamp)
+
+    def append_rows(self, rows, timestamp=None):
+        """
+        Method to store the rows of RedfishApi.multi_power_usage().
+        :param rows: rows [System IP, Manufacturer Model, current, average, max, min, power state], a total row is
+                     skipped.
+        :param timestamp: time.time() value of the cycle, default now.
+        :return: None
+        """
+        samples = [[row[0]] + row[2:6] for row in rows if len(row) >= 6 and row[0] != "Total No of Systems"]
+        self.append(time.time() if timestamp is None else timestamp, samples)
+
+    def _segment(self, timestamp):
+        segment_start = int(timestamp // self.segment_seconds * self.segment_seconds)
+        if segment_start != self._segment_start:
+            if self._segment_file is not None:
+                self._segment_file.close()
+                self._sort_segment(self._segment_file.name)
+            self._last_timestamp = None
+            segment_path = os.path.join(self.path, "{}{}".format(segment_start, SEGMENT_SUFFIX))
+            self._segment_file = open(segment_path, "ab")
+            size = self._segment_file.tell()
+            if size % RECORD.size:
+                # drop a record torn by an interrupted write
+                logger.error("{} ends with a partial record, truncating it".format(segment_path))
+                self._segment_file.truncate(size - size % RECORD.size)
+                self._segment_file.seek(0, os.SEEK_END)
+                size = self._segment_file.tell()
+            if size:
+                with open(segment_path, "rb") as records:
+                    records.seek(size - RECORD.size)
+                    self._last_timestamp = struct.unpack("<d", records.read(8))[0]
+            self._segment_start = segment_start
+        return self._segment_file
+
+    def _sort_segment(self, segment_path):
+        unsorted_path = segment_path + UNSORTED_SUFFIX
+        if not os.path.exists(unsorted_path):
+            return
+        with open(segment_path, "rb") as segment_file:
+            data = segment_file.read()
+        tmp_path = segment_path + ".tmp"
+        with open(tmp_path, "wb") as segment_file:
+            segment_file.write(sort_records(data[:len(data) - len(data) % RECORD.size]))
+        os.replace(tmp_path, segment_path)
+        os.remove(unsorted_path)
+
+    def segments(self, start=None, end=None):
+        """
+        Method to list the segment files holding samples between start and end.
+        :param start: time.time() value, None for no lower bound.
+        :param end: time.time() value, None for no upper bound.
+        :return: list of segment paths in time order
+        """
+        segment_starts = sorted(int(name[:-len(SEGMENT_SUFFIX)]) for name in os.listdir(self.path)
+                                if name.endswith(SEGMENT_SUFFIX))
+        return [os.path.join(self.path, "{}{}".format(segment_start, SEGMENT_SUFFIX))
+                for segment_start in segment_starts
+                if (start is None or segment_start + self.segment_seconds > start)
+                and (end is None or segment_start <= end)]
+
+    def read_bytes(self, start=None, end=None):
+        """
+        Method to read the raw records between start (inclusive) and end (exclusive).
+        :param start: time.time() value, None for no lower bound.
+        :param end: time.time() value, None for no upper bound.
+        :return: bytes of packed RECORDs
+        """
+        chunks = []
+        for segment_path in self.segments(start, end):
+            if os.path.exists(segment_path + UNSORTED_SUFFIX):
+                with open(segment_path, "rb") as segment_file:
+                    data = segment_file.read()
+                records = sort_records(data[:len(data) - len(data) % RECORD.size])
+                count = len(records) // RECORD.size
+                first = 0 if start is None else self._bisect(records, count, start)
+                last = count if end is None else self._bisect(records, count, end)
+                chunks.append(records[first * RECORD.size:last * RECORD.size])
+                continue
+            with open(segment_path, "rb") as segment_file:
+                size = os.fstat(segment_file.fileno()).st_size
+                count = size // RECORD.size
+                if count == 0:
+                    continue
+                with mmap.mmap(segment_file.fileno(), 0, access=mmap.ACCESS_READ) as records:
+                    first = 0 if start is None else self._bisect(records, count, start)
+                    last = count if end is None else self._bisect(records, count, end)
+                    chunks.append(records[first * RECORD.size:last * RECORD.size])
+        return b"".join(chunks)
+
+    def _bisect(self, records, count, timestamp):
+        low, high = 0, count
+        while low < high:
+            middle = (low + high) // 2
+            if struct.unpack_from("<d", records, middle * RECORD.size)[0] < timestamp:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def read(self, start=None, end=None, login_host=None):
+        """
+        Method to read the samples between start (inclusive) and end (exclusive).
+        :param start: time.time() value, None for no lower bound.
+        :param end: time.time() value, None for no upper bound.
+        :param login_host: only samples of this host, None for all hosts.
+        :return: generator of (timestamp, login_host, current, average, max, min)
+        """
+        host_id = self._hosts.get(login_host) if login_host is not None else None
+        if login_host is not None and host_id is None:
+            return
+        for timestamp, record_host, *watts in RECORD.iter_unpack(self.read_bytes(start, end)):
+            if host_id is None or record_host == host_id:
+                yield (timestamp, self.host_name(record_host), *watts)
+
+    def export_csv(self, csv_path, start=None, end=None):
+        """
+        Method to write the samples in the records.csv layout: one row per polling cycle with the current power of
+        every host.
+        :param csv_path: path of the csv file.
+        :param start: time.time() value, None for no lower bound.
+        :param end: time.time() value, None for no upper bound.
+        :return: number of rows written
+        """
+        hosts = sorted(self._hosts, key=self._hosts.get)
+        rows = 0
+        with open(csv_path, "w", newline="") as csv_file:
+            csvwriter = csv.writer(csv_file)
+            csvwriter.writerow(["date_time"] + ["server_power(w): {}".format(login_host) for login_host in hosts])
+            cycle_time, cycle = None, {}
+            for timestamp, login_host, current, average, maximum, minimum in self.read(start, end):
+                if timestamp != cycle_time and cycle:
+                    csvwriter.writerow(self._csv_row(cycle_time, cycle, hosts))
+                    rows += 1
+                    cycle = {}
+                cycle_time = timestamp
+                cycle[login_host] = current
+            if cycle:
+                csvwriter.writerow(self._csv_row(cycle_time, cycle, hosts))
+                rows += 1
+        return rows
+
+    def _csv_row(self, timestamp, cycle, hosts):
+        values = []
+        for login_host in hosts:
+            current = cycle.get(login_host, math.nan)
+            values.append("N/A" if math.isnan(current) else int(current) if current.is_integer() else current)
+        return [str(datetime.fromtimestamp(timestamp))] + values
+
+    def close(self):
+        """
+        Method to close the open segment file.
+        :return: None
+        """
+        with self._lock:
+            if self._segment_file is not None:
+                self._segment_file.close()
+                self._sort_segment(self._segment_file.name)
+                self._segment_file = None
+                self._segment_start = None
@@ -1,28 +1,111 @@
 #Copyright (c) 2024 Samsung Electronics Corporation
 #SPDX-License-Identifier: BSD-3-Clause
 
+import atexit
+import hashlib
 import json
 import os
 import re
 import sys
+import threading
 import time
 import traceback
-from datetime import datetime
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from urllib.parse import quote
 
 import redfish  # DMTF's python-redfish-library, you can install it by using "pip3 install redfish"-command in your system. Python3 library to interact with devices that supports redfish service.
 import requests
 import yaml  # pyyaml version>=5.1
-from jsonschema import validate
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../lib")))
 import logger as logging
+from discovery_cache import DiscoveryCache, IDENTITY_FIELDS
+from event_listener import EventListener
+from log_checkpoints import LogCheckpoints
+from log_store import LogStore, created_timestamp
+from host_context import HostContext, bind_context
+from openapi_index import OpenApiPathIndex
+from resource_cache import ResourceCache
+from single_flight import SingleFlight
+from task_monitor import TaskMonitor
+from schema_registry import SchemaRegistry
+from validation_pipeline import ValidationPipeline, check_instance, validation_row
+from session_pool import SessionPool
 
 logger = logging.get_logger(__name__)
 
 
 class RedfishApi:
     def __init__(self):
-        pass
+        self._local = threading.local()
+        self.default_context = HostContext()
+        self.fetch_executors = {}
+        self.fetch_executors_lock = threading.Lock()
+        self.single_flight = SingleFlight()
+        self.task_monitor = TaskMonitor()
+
+    def current_context(self):
+        """
+        Method to get the host context the calling thread works on.
+        :return: HostContext bound by use_context(), otherwise the default context.
+        """
+        return getattr(self._local, "context", None) or self.default_context
+
+    @contextmanager
+    def use_context(self, ctx):
+        """
+        Method to bind a host context to the calling thread for the duration of a with-block.
+        :param ctx: HostContext to run against.
+        """
+        previous = getattr(self._local, "context", None)
+        self._local.context = ctx
+        try:
+            yield ctx
+        finally:
+            self._local.context = previous
+
+    @property
+    def REDFISH_OBJ(self):
+        return self.current_context().client
+
+    @REDFISH_OBJ.setter
+    def REDFISH_OBJ(self, client):
+        self.current_context().client = client
+
+    @property
+    def redfish_version(self):
+        return self.current_context().redfish_version
+
+    @redfish_version.setter
+    def redfish_version(self, redfish_version):
+        self.current_context().redfish_version = redfish_version
+
+    @property
+    def system_manufacturer(self):
+        return self.current_context().system_manufacturer
+
+    @system_manufacturer.setter
+    def system_manufacturer(self, system_manufacturer):
+        self.current_context().system_manufacturer = system_manufacturer
+
+    @property
+    def system_model(self):
+        return self.current_context().system_model
+
+    @system_model.setter
+    def system_model(self, system_model):
+        self.current_context().system_model = system_model
+
+    @property
+    def html_results(self):
+        return self.current_context().html_results
+
+    @html_results.setter
+    def html_results(self, html_results):
+        self.current_context().html_results = html_results
+
     def redfishapi(self):
         try:
             try:
@@ -33,39 +116,51 @@ class RedfishApi:
                 sys.exit(1)
             self.html_results = ""
             self.REDFISH_OBJ_list = []
+            self.contexts = []
             self.login_host = self.config_dict["systems"][0]["login_host"]
+            self.host_semaphores = {}
+            self.fleet_executor = None
+            self.power_futures = {}
+            self.power_action_executor = None
+            self.power_action_futures = {}
+            self.log_executor = None
+            self.log_futures = {}
+            atexit.register(self.close)
+            self.session_pool = SessionPool(auth=self.config_dict.get("auth", "session"))
+            self.schema_registry = self.create_schema_registry()
+            self.validation_pipeline = self.create_validation_pipeline()
+            if self.config_dict.get("discovery_cache"):
+                self.discovery_cache = DiscoveryCache(self.config_dict["discovery_cache"],
+                                                      ttl=self.config_dict.get("discovery_cache_ttl", 86400))
+            else:
+                self.discovery_cache = None
+            if self.config_dict.get("log_checkpoints"):
+                self.log_checkpoints = LogCheckpoints(self.config_dict["log_checkpoints"])
+            else:
+                self.log_checkpoints = None
+            if self.config_dict.get("log_store"):
+                self.log_store = LogStore(self.config_dict["log_store"])
+            else:
+                self.log_store = None
             try:
-                for host in range(len(self.config_dict["systems"])):
-                    self.REDFISH_OBJ = redfish.redfish_client(
-                        base_url="https://" + self.config_dict["systems"][host]["login_host"],
-                        username=self.config_dict["systems"][host]["username"],
-                        password=self.config_dict["systems"][host]["password"])
-                    self.REDFISH_OBJ.login(auth="basic")
-                    self.redfish_version = (self.REDFISH_OBJ.get(self.config_dict["base_url"], None)).dict[
-                        "RedfishVersion"]
-                    logger.info(self.config_dict["systems"][host]["login_host"])
-                    logger.info(self.redfish_version)
-                    oem_keys=(self.REDFISH_OBJ.get(self.config_dict["base_url"], None)).dict["Oem"].keys()
-                    if self.redfish_version in ["1.8.0","1.11.0"]:
-                        if ((self.redfish_version == "1.11.0") and (list(oem_keys)[0] == "Dell")): 
-                            self.system_manufacturer = (self.REDFISH_OBJ.get(self.config_dict["system_url"], None)).dict[
-                            "Manufacturer"]
-                            logger.info(self.system_manufacturer)
-                            self.system_model = (self.REDFISH_OBJ.get(self.config_dict["system_url"], None)).dict["Model"]
-                            logger.info(self.system_model)
-                        else:
-                            self.system_manufacturer = (self.REDFISH_OBJ.get(self.config_dict["system_url_1_8"], None)).dict[
-                            "Manufacturer"]
-                            logger.info(self.system_manufacturer)
-                            self.system_model = (self.REDFISH_OBJ.get(self.config_dict["system_url_1_8"], None)).dict["Model"]
-                            logger.info(self.system_model)
-                    else:
-                        self.system_manufacturer = (self.REDFISH_OBJ.get(self.config_dict["system_url"], None)).dict[
-                            "Manufacturer"]
-                        logger.info(self.system_manufacturer)
-                        self.system_model = (self.REDFISH_OBJ.get(self.config_dict["system_url"], None)).dict["Model"]
-                        logger.info(self.system_model)
-                    self.REDFISH_OBJ_list.append(self.REDFISH_OBJ)
+                # one discovery cache write for the whole fleet
+                with self.discovery_batch():
+                    for host in range(len(self.config_dict["systems"])):
+                        login_host = self.config_dict["systems"][host]["login_host"]
+                        ctx = HostContext(login_host, redfish.redfish_client(
+                            base_url="https://" + login_host,
+                            username=self.config_dict["systems"][host]["username"],
+                            password=self.config_dict["systems"][host]["password"]))
+                        ctx.resource_cache = self.create_resource_cache()
+                        self.session_pool.connect(login_host, ctx.client)
+                        logger.info(login_host)
+                        self.discover_system_identity(ctx=ctx)
+                        self.host_semaphores[login_host] = threading.BoundedSemaphore(
+                            self.config_dict.get("fleet_host_concurrency", 1))
+                        self.contexts.append(ctx)
+                        self.REDFISH_OBJ_list.append(ctx.client)
+                # Methods called without ctx keep working on the last configured system.
+                self.default_context = self.contexts[-1].fork()
             except:
                 traceback.print_exc()
                 print("Error in making redfish object with given configurations")
@@ -76,7 +171,129 @@ class RedfishApi:
         except Exception as e:
             logger.error("error msg: {}".format(e))
             sys.exit(1)
-    
+
+    @bind_context
+    def discover_system_identity(self):
+        """
+        Method to read RedfishVersion, OEM vendor, system manufacturer, system model and the system, chassis and
+        manager urls of the host. A fresh discovery cache entry is used without any request, an expired entry is
+        kept when the service root ETag is unchanged.
+        :return: None
+        """
+        ctx = self.current_context()
+        discovery_cache = getattr(self, "discovery_cache", None)
+        entry = discovery_cache.get(ctx.login_host) if discovery_cache else None
+        if entry is not None and discovery_cache.is_fresh(entry):
+            self.apply_identity(ctx, entry)
+            return
+        headers = {"If-None-Match": entry["etag"]} if entry is not None and entry.get("etag") else None
+        response = self.send_request("get", self.config_dict["base_url"], headers=headers)
+        if response.status == 304:
+            etag = entry["etag"]
+        else:
+            etag = response.getheader("ETag") or response.dict.get("@odata.etag")
+        if entry is not None and etag and etag == entry.get("etag"):
+            logger.info("{} service root unchanged, using cached discovery".format(ctx.login_host))
+            discovery_cache.touch(ctx.login_host)
+            self.apply_identity(ctx, entry)
+            return
+        service_root = response.dict
+        entry = {"etag": etag, "redfish_version": service_root["RedfishVersion"]}
+        oem_keys = list(service_root.get("Oem", {}).keys())
+        entry["oem_vendor"] = oem_keys[0] if oem_keys else None
+        entry["protocol_features"] = self.parse_protocol_features(service_root)
+        if entry["redfish_version"] in ["1.8.0", "1.11.0"] and not (
+                entry["redfish_version"] == "1.11.0" and entry["oem_vendor"] == "Dell"):
+            system_url = self.config_dict["system_url_1_8"]
+        else:
+            system_url = self.config_dict["system_url"]
+        system_resource = self.send_request("get", system_url).dict
+        entry["system_manufacturer"] = system_resource["Manufacturer"]
+        entry["system_model"] = system_resource["Model"]
+        for collection, field in [("Systems", "system_urls"), ("Chassis", "chassis_urls"),
+                                  ("Managers", "manager_urls")]:
+            if collection in service_root:
+                members = self.send_request("get", service_root[collection]["@odata.id"]).dict.get("Members", [])
+                entry[field] = [member["@odata.id"] for member in members]
+            else:
+                entry[field] = []
+        self.apply_identity(ctx, entry)
+        if discovery_cache is not None:
+            discovery_cache.put(ctx.login_host, entry)
+
+    def parse_protocol_features(self, service_root):
+        """
+        Method to read the $expand and $select support of the host from ProtocolFeaturesSupported.
+        :param service_root: service root dict
+        :return: dict with "expand" ("." or "*" or None), "max_levels", "select", "filter" and "top_skip"
+        """
+        features = service_root.get("ProtocolFeaturesSupported", {})
+        expand_query = features.get("ExpandQuery", {})
+        if expand_query.get("NoLinks"):
+            # "." expands subordinate resources only, not the Links section
+            expand = "."
+        elif expand_query.get("ExpandAll"):
+            expand = "*"
+        else:
+            expand = None
+        return {"expand": expand,
+                "max_levels": expand_query.get("MaxLevels", 1) if expand_query.get("Levels") else None,
+                "select": bool(features.get("SelectQuery")),
+                "filter": bool(features.get("FilterQuery")),
+                "top_skip": bool(features.get("TopSkipQuery"))}
+
+    def ensure_system_identity(self, ctx):
+        """
+        Method to discover the host identity only when it is unknown or its discovery cache entry expired,
+        so that polling cycles don't repeat identity lookups.
+        :param ctx: HostContext of the host.
+        :return: None
+        """
+        discovery_cache = getattr(self, "discovery_cache", None)
+        if ctx.redfish_version is None or (
+                discovery_cache is not None and not discovery_cache.is_fresh(discovery_cache.get(ctx.login_host))):
+            self.discover_system_identity(ctx=ctx)
+
+    @contextmanager
+    def discovery_batch(self):
+        """
+        Method to write the discovery cache once for all hosts discovered in the with-block.
+        """
+        discovery_cache = getattr(self, "discovery_cache", None)
+        if discovery_cache is None:
+            yield
+        else:
+            with discovery_cache.batch():
+                yield
+
+    def invalidate_identity(self, url):
+        """
+        Method to drop the discovered identity of the host when one of its discovered system, chassis or manager
+        urls is gone (i.e the BMC re-enumerated its resources), so the next ensure_system_identity() discovers again.
+        :param url: url that returned 404
+        :return: None
+        """
+        ctx = self.current_context()
+        if not any(url in (urls or []) for urls in [ctx.system_urls, ctx.chassis_urls, ctx.manager_urls]):
+            return
+        logger.info("{} returned 404 for discovered url {}, discovering again".format(ctx.login_host, url))
+        ctx.redfish_version = None
+        discovery_cache = getattr(self, "discovery_cache", None)
+        if discovery_cache is not None:
+            discovery_cache.invalidate(ctx.login_host)
+
+    def apply_identity(self, ctx, entry):
+        """
+        Method to copy a discovery entry into the host context.
+        :param ctx: HostContext of the host.
+        :param entry: dict with the identity fields of DiscoveryCache.
+        :return: None
+        """
+        for field in IDENTITY_FIELDS:
+            setattr(ctx, field, entry.get(field))
+        logger.info("{} {} {} {}".format(ctx.login_host, ctx.redfish_version, ctx.system_manufacturer,
+                                         ctx.system_model))
+
     def get_extended_error_msg(self, response_body):
         """
         Method to get extended error message from response body
@@ -95,13 +312,116 @@ class RedfishApi:
             msg = response_body
             return msg
 
-    def redfish_response(self, method, url, body=None, headers=None):
+    def send_request(self, method, url, body=None, headers=None):
+        """
+        Method to send one request with the client of the current host.
+        If the BMC rejects the session with 401 the host is re-authenticated once and the request is repeated.
+        :param method: 'get','post','patch','delete'
+        :param url: url of the request
+        :param body: request body for patch and post
+        :param headers: request headers
+        :return: redfish library response
+        """
+        ctx = self.current_context()
+        session_pool = getattr(self, "session_pool", None)
+        generation = session_pool.generation(ctx.login_host) if session_pool else None
+        for attempt in range(2):
+            if method == "get":
+                response = self.REDFISH_OBJ.get(url, None, headers=headers)
+            elif method == "patch":
+                response = self.REDFISH_OBJ.patch(url, body=body, headers=headers)
+            elif method == "post":
+                response = self.REDFISH_OBJ.post(url, body=body, headers=headers)
+            else:
+                response = self.REDFISH_OBJ.delete(url, headers=headers)
+            if response.status != 401 or session_pool is None or attempt == 1:
+                return response
+            logger.info("'{}' for url : '{}' returned 401, re-authenticating {}".format(method, url, ctx.login_host))
+            session_pool.reauthenticate(ctx.login_host, generation)
+
+    def invalidate_resource_cache(self):
+        """
+        Method to drop the cached GET responses of the current host after a request changed its state.
+        :return: None
+        """
+        cache = self.current_context().resource_cache
+        if cache is not None:
+            cache.clear()
+
+    def create_resource_cache(self):
+        """
+        Method to create the GET response cache of one host.
+        :return: ResourceCache or None when "resource_cache_size" is 0
+        """
+        max_entries = self.config_dict.get("resource_cache_size", 512)
+        if not max_entries:
+            return None
+        return ResourceCache(max_entries=max_entries, ttl=self.config_dict.get("resource_cache_ttl", 5))
+
+    def cached_get(self, url, max_age=None):
+        """
+        Method to GET an url through the resource cache of the current host.
+        A cached response younger than max_age is returned without a request, an older one is revalidated with
+        If-None-Match and reused when the BMC answers 304 Not Modified. Concurrent GETs of the same url on the
+        same host share one request.
+        :param url: url of the request
+        :param max_age: seconds a cached response may be reused, None uses "resource_cache_ttl", 0 always revalidates.
+        :return: redfish library response
+        """
+        ctx = self.current_context()
+        cache = ctx.resource_cache
+        if cache is None:
+            return self.single_flight.do((ctx.login_host, url), lambda: self.send_request("get", url))
+        entry = cache.lookup(url)
+        if entry is not None and cache.is_fresh(entry, max_age):
+            cache.hits += 1
+            return entry.response
+        return self.single_flight.do((ctx.login_host, url), lambda: self.revalidate(cache, url))
+
+    def revalidate(self, cache, url):
+        """
+        Method to GET an url that is not fresh in the resource cache, conditionally when an ETag is cached.
+        :param cache: ResourceCache of the current host
+        :param url: url of the request
+        :return: redfish library response
+        """
+        entry = cache.lookup(url)
+        headers = {"If-None-Match": entry.etag} if entry is not None and entry.etag else None
+        response = self.send_request("get", url, headers=headers)
+        if response.status == 304 and entry is not None:
+            cache.revalidated += 1
+            cache.refresh(entry)
+            return entry.response
+        cache.misses += 1
+        if response.status == 200:
+            cache.store(url, response)
+        return response
+
+    @bind_context
+    def submit_task(self, response):
+        """
+        Method to hand the response of a PATCH/POST to the task monitor.
+        :param response: redfish library response of the PATCH/POST
+        :return: Future resolved with the final task response
+        """
+        ctx = self.current_context()
+
+        def poll(task_location):
+            with self.use_context(ctx):
+                return self.send_request("get", task_location)
+        return self.task_monitor.watch(response, poll)
+
+    @bind_context
+    def redfish_response(self, method, url, body=None, headers=None, max_age=None, wait_task=True):
         """
         Method to get json response from given request( i.e. get,post,patch etc)
         :param method: method refers to the 'get','post','patch','delete' here
         :param url: url from which response is required
         :param body: request body for certain requests(i.e. patch,post etc), default value is None
         :param headers: request headers, default value is None
+        :param max_age: for 'get', seconds a cached response may be reused, 0 always revalidates with the BMC.
+        :param wait_task: for 'patch' and 'post', wait until the started task finished. With False the response
+                          is returned at once and submit_task(response) gives a Future of the task.
         :return: Bool,json response
         """
         try:
@@ -115,41 +435,37 @@ class RedfishApi:
                 self.html_results = self.html_results + "<td class=\"notvalid center\" width=\"30%\">N/A</td></tr>"
             # Getting HTTP responses:
             if method == "get":
-                response = self.REDFISH_OBJ.get(url, None)
+                response = self.cached_get(url, max_age)
                 if response.status in self.config_dict["response_codes"]["success"]:
                     # Validating Json Schema for "GET" response bodies:
                     self.validate_json(url, response)
                     return True, response
                 else:
+                    if response.status == 404:
+                        self.invalidate_identity(url)
                     raise Exception("Failed")
             elif method == "patch":
-                response = self.REDFISH_OBJ.patch(url, body=body, headers=headers)
+                response = self.send_request("patch", url, body=body, headers=headers)
                 if response.status in self.config_dict["response_codes"]["success"]:
-                    task = response.monitor(self.REDFISH_OBJ)
-                    while task.is_processing:
-                        retry_time = task.retry_after
-                        task_status = task.dict["TaskState"]
-                        time.sleep(retry_time if retry_time else 5)
-                        task = response.monitor(self.REDFISH_OBJ)
-                    # print(self.redfish_response("get",url)[1].dict[list(body.keys())[0]])
+                    self.invalidate_resource_cache()
+                    if wait_task:
+                        self.submit_task(response).result()
                     return True, response
                 else:
                     raise Exception("Failed")
             elif method == "post":
-                response = self.REDFISH_OBJ.post(url, body=body, headers=headers)
+                response = self.send_request("post", url, body=body, headers=headers)
                 if response.status in self.config_dict["response_codes"]["success"]:
-                    task = response.monitor(self.REDFISH_OBJ)
-                    while task.is_processing:
-                        retry_time = task.retry_after
-                        task_status = task.dict["TaskState"]
-                        time.sleep(retry_time if retry_time else 5)
-                        task = response.monitor(self.REDFISH_OBJ)
+                    self.invalidate_resource_cache()
+                    if wait_task:
+                        self.submit_task(response).result()
                     return True, response
                 else:
                     raise Exception("Failed")
             elif method == "delete":
-                response = self.REDFISH_OBJ.delete(url, headers=headers)
+                response = self.send_request("delete", url, headers=headers)
                 if response.status in self.config_dict["response_codes"]["success"]:
+                    self.invalidate_resource_cache()
                     return True, response
                 else:
                     raise Exception("Failed")
@@ -197,92 +513,151 @@ class RedfishApi:
         except Exception as e:
             logger.error("error msg: {}".format(e))
 
+    def schema_registry_options(self):
+        """
+        Method to get the json schema registry options from "schema_dir", "schema_bundle", "schema_cache_size" and
+        "schema_offline" of the configuration.
+        :return: dict of SchemaRegistry arguments
+        """
+        return {"schema_dir": self.config_dict.get("schema_dir"),
+                "bundle": self.config_dict.get("schema_bundle"),
+                "schema_url": self.config_dict["schema_url"],
+                "max_size": self.config_dict.get("schema_cache_size", 256),
+                "offline": self.config_dict.get("schema_offline", False)}
+
+    def create_schema_registry(self):
+        """
+        Method to create the json schema registry of the configuration.
+        :return: SchemaRegistry
+        """
+        return SchemaRegistry(**self.schema_registry_options())
+
     def get_schema_from_redfish_org(self, schema_name):
         """
-        Method to get particular json schema for passed schema name from schema url of redfish organisation
+        Method to get particular json schema for passed schema name, through the json schema registry
         :param schema_name: Schema name got from '@odata.type'
         :return: Bool,string output for json schema
         """
-        try:
-            result = requests.get(self.config_dict["schema_url"] + schema_name)
-            if result.status_code != 200:
-                raise Exception("Failed")
-            return True, result.text  # string result is returned
-        except:
-            logger.error("{}-not found with response code as:{}".format(schema_name, result.status_code))
+        schema = self.schema_registry.get(schema_name)
+        if schema is None:
             return False, None
+        return True, json.dumps(schema)  # string result is returned
+
+    def create_validation_pipeline(self):
+        """
+        Method to create the process pool validation stage when "validation_workers" is set.
+        :return: ValidationPipeline or None for inline validation
+        """
+        workers = self.config_dict.get("validation_workers", 0)
+        if not self.config_dict["validate_json"] or not workers:
+            return None
+        return ValidationPipeline(self.schema_registry_options(), workers,
+                                  max_pending=self.config_dict.get("validation_max_pending", 10000))
 
     def validate_json(self, url, json_response):
         """
         Method to validate json response body with standard json schema( acc. to redfish specification)
+        With "validation_workers" set, the body is handed to the validation pipeline and the report gets a marker
+        that finish_json_validation() replaces by the result.
         :param url: url of which response to be validated
         :param json_response: JSON response body
         :return: None
         """
         try:
             if self.config_dict["validate_json"]:
+               if "?" in url:
+                  # $expand and $select bodies don't match the resource schema
+                  self.html_results = self.html_results + "<td class=\"notvalid center\" width=\"30%\">N/A</td></tr>"
+                  return
                bool_resp1, schema_name = self.parseOdataType(json_response)
                if bool_resp1 == True:
                   print(schema_name)
                else:
                   logger.error("@odata.type is not present in response")
                   return
-               bool_resp2, schema = self.get_schema_from_redfish_org(schema_name)
-               if bool_resp2 == True:
-                  schema_dict = json.loads(schema)  # string is converted into python dict object.
-               else:
+               if self.validation_pipeline is not None:
+                  self.html_results = self.html_results + self.validation_pipeline.submit(url, schema_name,
+                                                                                         json_response.dict)
                   return
-               validate(instance=json_response.dict, schema=schema_dict)
-               logger.info("JSON schema validated for url '{}'".format(url))
-               # HTML report data for passed validation
-               msg = "PASS"
-               result_class = "class=\"pass center\""
-               self.html_results = self.html_results + "<td " + result_class + " width=\"30%\">" + msg + "</td></tr>"
+               result = check_instance(self.schema_registry, schema_name, json_response.dict)
+               # HTML report data for passed or failed validation
+               self.html_results = self.html_results + validation_row(url, result)
             else:
                 logger.info("user disabled the json schema validation for the url")
         except Exception as e:
             # traceback.print_exc()
-            logger.error("JSON schema doesn't match for url '{}'".format(url))
-            logger.error(
-                "EXACT MISMATCH MSG OF RESPONSE BODY WITH JSON SCHEMA :\n{}\n\nRESPONSE BODY PARAMETERS:\n{},\nPRESENT AT: '{}' \nDOESN'T MATCHES WITH\nJSON SCHEMA PARAMETERS:\n{},\nPRESENT AT: '{}'" \
-                    .format(e.message, e.instance, e.path, e.schema,
-                            e.schema_path))  # if you want exact reason for schema mismatch.
-            # HTML report data for failed validation
-            msg = "FAIL: JSON schema doesn't matches for this URI because of the reason : {}".format(e.message)
-            result_class = "class=\"fail center\""
-            self.html_results = self.html_results + "<td " + result_class + " width=\"30%\">" + msg + "</td></tr>"
+            logger.error("JSON schema validation failed for url '{}', error msg: {}".format(url, e))
+
+    def finish_json_validation(self):
+        """
+        Method to wait for the validation pipeline and put its PASS/FAIL results into the HTML reports.
+        Call it before generating a report when "validation_workers" is set.
+        :return: None
+        """
+        if self.validation_pipeline is None:
+            return
+        for ctx in [self.default_context] + getattr(self, "contexts", []):
+            ctx.html_results = self.validation_pipeline.resolve(ctx.html_results)
 
     def get_openapi_from_redfish_org(self):
         """
         Method to get openapi.yaml schema file from openapi url of redfish organisation
         :return: Bool,string output for openapi schema file
         """
+        result = None
         try:
-            #if len(self.openapi_dict) > 0:
-            #    pass
-            #    #return
             filename = self.config_dict["filename"]
             if os.path.exists(filename) != True:
                 print("Not exists", self.config_dict["openapi_url"])
                 result = requests.get(self.config_dict["openapi_url"])
-                if result.status_code == 200:
-                    #raise Exception("Failed")
-                    try:
-                        self.openapi_dict = yaml.load(result.text, Loader=yaml.FullLoader)
-                        f = open(filename, "w")
-                        f.write(result.text)
-                        f.close()
-                    except Exception as e:
-                        logger.error("error msg: {}".format(e))
-                        sys.exit(1)
-            else:
-                with open(filename, 'r') as file:
-                    self.openapi_dict = yaml.safe_load(file)
-        except:
-            logger.error("Resource not found at {} with response code as:{}".format(self.config_dict["openapi_url"],
-                                                                                    result.status_code))
+                if result.status_code != 200:
+                    raise Exception("Failed")
+                with open(filename, "w") as f:
+                    f.write(result.text)
+            self.load_openapi_spec(filename)
+        except Exception as e:
+            logger.error("Resource not found at {} with response code as:{}, error msg: {}".format(
+                self.config_dict["openapi_url"], result.status_code if result is not None else None, e))
             sys.exit(1)
 
+    def load_openapi_spec(self, filename):
+        """
+        Method to load the paths of openapi.yaml and build the openApi path index.
+        Parsed paths are cached as JSON next to the spec ("openapi_cache") and reused as long as the sha256 of the
+        spec file is unchanged, the index is rebuilt from them. YAML is parsed with the libyaml C loader when it is
+        available.
+        :param filename: path of openapi.yaml
+        :return: None
+        """
+        with open(filename, "rb") as spec_file:
+            spec = spec_file.read()
+        spec_hash = hashlib.sha256(spec).hexdigest()
+        cache_file = self.config_dict.get("openapi_cache") or filename + ".cache"
+        if os.path.exists(cache_file):
+            try:
+                with open(cache_file) as f:
+                    cached = json.load(f)
+                if cached["sha256"] == spec_hash:
+                    self.openapi_dict = {"paths": cached["paths"]}
+                    self.openapi_index = OpenApiPathIndex(self.openapi_dict["paths"])
+                    logger.info("{} openApi paths loaded from {}".format(len(self.openapi_index), cache_file))
+                    return
+            except Exception as e:
+                logger.error("openApi cache {} is not usable and will be rebuilt, error msg: {}".format(cache_file,
+                                                                                                       e))
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+        self.openapi_dict = {"paths": yaml.load(spec, Loader=loader)["paths"]}
+        self.openapi_index = OpenApiPathIndex(self.openapi_dict["paths"])
+        logger.info("{} openApi paths indexed".format(len(self.openapi_index)))
+        try:
+            tmp_path = cache_file + ".tmp"
+            with open(tmp_path, "w") as f:
+                # default=str: YAML dates and the like of the path definitions
+                json.dump({"sha256": spec_hash, "paths": self.openapi_dict["paths"]}, f, default=str)
+            os.replace(tmp_path, cache_file)
+        except Exception as e:
+            logger.error("openApi cache {} could not be written, error msg: {}".format(cache_file, e))
+
     def validate_uri(self, uri):
         """
         Method to validate passed URI with standard URIs present in openapi schema file
@@ -295,13 +670,11 @@ class RedfishApi:
                 return
             self.html_results = self.html_results + "<tr>"
             self.html_results = self.html_results + "<td>" + uri + "</td>"
-            for openapi_uri in self.openapi_dict["paths"]:
-                # Check if the pattern in the path object matches the uri
-                uri_pattern = "^" + re.sub("{[A-Za-z0-9]+}", "[^/]+", openapi_uri) + "$"
-                if re.match(uri_pattern, uri) is not None:
-                    print("OpenApi specified uri:- " + uri_pattern)
-                    uri_match = True
-                    break
+            # Check if a path of the openApi index matches the uri
+            openapi_uri = self.openapi_index.match(uri)
+            if openapi_uri is not None:
+                print("OpenApi specified uri:- " + openapi_uri)
+                uri_match = True
             if uri_match == False:
                 logger.error("{} was not found in the openApi specification".format(uri))
                 # HTML report data for failed validation
@@ -318,6 +691,7 @@ class RedfishApi:
             # traceback.print_exc()
             logger.error("error msg : {}".format(e))
 
+    @bind_context
     def get_base_url_response(self):
         """
         Method to get base url(/redfish/v1) response
@@ -333,6 +707,7 @@ class RedfishApi:
         except:
             return False, None
 
+    @bind_context
     def get_system_url(self, system_coll_url, system_id=None):
         """
         Method to get system_urls of passed system id
@@ -372,6 +747,157 @@ class RedfishApi:
             logger.error("error msg: {}".format(e))
             return False, system
 
+    def query_params(self, levels=None, select=None):
+        """
+        Method to get the $expand and $select query parameters the current host supports, when "use_expand" is on.
+        :param levels: number of levels to expand, None for no $expand.
+        :param select: list of properties to select, None for no $select.
+        :return: list of query parameters
+        """
+        features = self.current_context().protocol_features
+        if not features or not self.config_dict.get("use_expand", True):
+            return []
+        query = []
+        if levels and features["expand"]:
+            expand = features["expand"]
+            if features["max_levels"]:
+                expand = expand + "($levels={})".format(min(levels, features["max_levels"]))
+            query.append("$expand=" + expand)
+        if select and features["select"]:
+            query.append("$select=" + ",".join(select))
+        return query
+
+    def query_url(self, url, levels=None, select=None):
+        """
+        Method to add $expand and $select to an url when the current host supports them and "use_expand" is on.
+        :param url: resource url
+        :param levels: number of levels to expand, None for no $expand.
+        :param select: list of properties to select, None for no $select.
+        :return: url with query parameters or the url unchanged
+        """
+        query = self.query_params(levels, select)
+        return url + "?" + "&".join(query) if query else url
+
+    def probe_query(self, query_url, features, max_age=None):
+        """
+        Method to GET an url with query parameters that ProtocolFeaturesSupported announced but the BMC may still
+        reject. A rejected query is not logged as an error nor reported, the features it used are switched off for
+        the host so the next requests go without them.
+        :param query_url: url with query parameters
+        :param features: keys of protocol_features the query uses (i.e ["expand", "select"])
+        :param max_age: seconds a cached response may be reused, 0 always revalidates.
+        :return: Bool, response
+        """
+        ctx = self.current_context()
+        response = self.cached_get(query_url, max_age)
+        if response.status not in self.config_dict["response_codes"]["success"]:
+            logger.info("{} rejected the query with response code {}, not using {} for {}".format(
+                query_url, response.status, ", ".join(features), ctx.login_host))
+            ctx.protocol_features = dict(ctx.protocol_features, **{feature: None for feature in features})
+            return False, response
+        if self.config_dict["validate_url"]:
+            self.validate_uri(query_url)
+        self.validate_json(query_url, response)
+        return True, response
+
+    def get_resource(self, url, levels=None, select=None):
+        """
+        Method to GET a resource with $expand/$select when the host supports them. If the BMC rejects the query
+        the plain url is requested instead.
+        :param url: resource url
+        :param levels: number of levels to expand
+        :param select: list of properties to select
+        :return: Bool, resource dict
+        """
+        query_url = self.query_url(url, levels, select)
+        if query_url != url:
+            bool_resp, response = self.probe_query(query_url, ["expand"] * ("$expand" in query_url) +
+                                                   ["select"] * ("$select" in query_url))
+            if bool_resp == True:
+                return True, response.dict
+        bool_resp, response = self.redfish_response("get", url)
+        if bool_resp == False:
+            return False, None
+        return True, response.dict
+
+    def resolve_link(self, link, select=None):
+        """
+        Method to get the resource of a navigation link, without a request when $expand already inlined it.
+        :param link: dict with "@odata.id", or the expanded resource
+        :param select: list of properties to select when the link has to be requested.
+        :return: Bool, resource dict
+        """
+        if any(not key.startswith("@odata.") for key in link):
+            return True, link
+        return self.get_resource(link["@odata.id"], select=select)
+
+    def fetch_executor(self, login_host):
+        """
+        Method to get the thread pool that fetches sibling resources of one host.
+        :param login_host: host ip or name.
+        :return: ThreadPoolExecutor or None when "per_host_fetch_workers" is 1 or less.
+        """
+        workers = self.config_dict.get("per_host_fetch_workers", 1)
+        if workers <= 1:
+            return None
+        with self.fetch_executors_lock:
+            if login_host not in self.fetch_executors:
+                self.fetch_executors[login_host] = ThreadPoolExecutor(max_workers=workers,
+                                                                      thread_name_prefix="fetch-" + str(login_host))
+            return self.fetch_executors[login_host]
+
+    def close(self):
+        """
+        Method to stop the thread pools of the fleet and of the hosts, called at exit as well.
+        :return: None
+        """
+        with self.fetch_executors_lock:
+            executors = list(self.fetch_executors.values())
+            self.fetch_executors.clear()
+        for name in ["fleet_executor", "power_action_executor", "log_executor"]:
+            if getattr(self, name, None) is not None:
+                executors.append(getattr(self, name))
+                setattr(self, name, None)
+        for executor in executors:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def fetch_links(self, links, select=None):
+        """
+        Method to resolve sibling links (i.e all drives of a storage controller) over the fetch pool of the host.
+        Every request runs on a fork of the current context, the report rows are merged back in link order.
+        :param links: list of dicts with "@odata.id", or expanded resources
+        :param select: list of properties to select when a link has to be requested.
+        :return: Bool, list of resource dicts in the order of links
+        """
+        ctx = self.current_context()
+        pending = [link for link in links if not any(not key.startswith("@odata.") for key in link)]
+        executor = self.fetch_executor(ctx.login_host)
+        # a walker already running in the pool resolves its links itself, waiting on the pool could deadlock it
+        if executor is None or len(pending) <= 1 or getattr(self._local, "in_fetch_pool", False):
+            resources = []
+            for link in links:
+                bool_resp, resource = self.resolve_link(link, select)
+                if bool_resp == False:
+                    return False, resources
+                resources.append(resource)
+            return True, resources
+        forks = [ctx.fork() for link in links]
+        futures = [executor.submit(self._fetch_link, fork, link, select) for fork, link in zip(forks, links)]
+        results = [future.result() for future in futures]
+        for fork in forks:
+            self.html_results = self.html_results + fork.drain_report()
+        resources = []
+        for bool_resp, resource in results:
+            if bool_resp == False:
+                return False, resources
+            resources.append(resource)
+        return True, resources
+
+    def _fetch_link(self, ctx, link, select):
+        self._local.in_fetch_pool = True
+        with self.use_context(ctx):
+            return self.resolve_link(link, select)
+
     def add_data(self, fxn_name):
         """
         Method to add heading in HTML report before every API start its functions.
@@ -383,6 +909,7 @@ class RedfishApi:
         self.html_results = self.html_results + "<tr><th>URIs</th><th>URI validation</th><th>JSON schema validation</th></tr>"
 
     ############################################################################
+    @bind_context
     def get_all_bios_attributes(self) -> (bool, list):
         """
         Method to get all bios attributes.
@@ -440,6 +967,7 @@ class RedfishApi:
             logger.error("error msg: {}".format(e))
             return False, attributes
 
+    @bind_context
     def get_power_state(self) -> (bool, list):
         """
         Method to get power state of the system.
@@ -458,7 +986,7 @@ class RedfishApi:
             if bool_resp1 == True:
                 for i in range(len(system)):
                     system_x_url = system[i]
-                    bool_resp2, response_system_x_url = self.redfish_response("get", system_x_url)
+                    bool_resp2, response_system_x_url = self.redfish_response("get", system_x_url, max_age=0)
                     if bool_resp2 == True:
                         power_state = {}
                         power_state["SystemUrl"] = system_x_url
@@ -474,6 +1002,7 @@ class RedfishApi:
             logger.error("error msg: {}".format(e))
             return False, power_details
 
+    @bind_context
     def get_chassis_inventory(self) -> (bool, list):
         """
         Method to get chassis inventory.
@@ -486,23 +1015,19 @@ class RedfishApi:
             if bool_resp == False:
                 raise Exception("Failed")
             chassis_url = response_base_url.dict["Chassis"]["@odata.id"]
-            bool_resp1, response_chassis_url = self.redfish_response("get", chassis_url)
+            bool_resp1, chassis_collection = self.get_resource(chassis_url, levels=1)
             if bool_resp1 == True:
-                count = response_chassis_url.dict["Members@odata.count"]
-                for i in range(count):
-                    chassis_x_url = response_chassis_url.dict["Members"][i]["@odata.id"]
-                    bool_resp2, response_chassis_x_url = self.redfish_response("get", chassis_x_url)
-                    if bool_resp2 == True:
-                        chassis_x_inv = response_chassis_x_url.dict
-                        for attr in ["@odata.type", "ThermalSubsystem", "PowerSubsystem", "EnvironmentMetrics",
-                                     "Sensors", "Controls", "Thermal", \
-                                     "Thermal@Redfish.Deprecated", "Thermal", "Power@Redfish.Deprecated", "Power",
-                                     "Links", "@odata.id"]:
-                            if attr in chassis_x_inv.keys():
-                                del chassis_x_inv[attr]
-                        chassis_inv.append(chassis_x_inv)
-                    else:
-                        raise Exception("Failed")
+                bool_resp2, chassis_members = self.fetch_links(chassis_collection["Members"])
+                if bool_resp2 == False:
+                    raise Exception("Failed")
+                for chassis_x_inv in chassis_members:
+                    for attr in ["@odata.type", "ThermalSubsystem", "PowerSubsystem", "EnvironmentMetrics",
+                                 "Sensors", "Controls", "Thermal", \
+                                 "Thermal@Redfish.Deprecated", "Thermal", "Power@Redfish.Deprecated", "Power",
+                                 "Links", "@odata.id"]:
+                        if attr in chassis_x_inv.keys():
+                            del chassis_x_inv[attr]
+                    chassis_inv.append(chassis_x_inv)
                 return True, chassis_inv
             else:
                 raise Exception("Failed")
@@ -511,6 +1036,7 @@ class RedfishApi:
             logger.error("error msg: {}".format(e))
             return False, chassis_inv
 
+    @bind_context
     def get_bios_attribute(self) -> (bool, list):
         """
         Method to get particular attribute of BIOS.
@@ -554,6 +1080,7 @@ class RedfishApi:
             logger.error("error msg: {}".format(e))
             return False, attr_list
 
+    @bind_context
     def get_temperatures_inventory(self) -> (bool, list):
         """
         Method to get temperature inventory.
@@ -601,6 +1128,7 @@ class RedfishApi:
             logger.error("error_msg: {}".format(e))
             return False, None
 
+    @bind_context
     def get_storage_inventory(self) -> (bool, list):
         """
         Method to get storage inventory
@@ -619,73 +1147,65 @@ class RedfishApi:
             if bool_resp1 == True:
                 for i in range(len(system)):
                     system_x_url = system[i]
-                    bool_resp2, response_system_x_url = self.redfish_response("get", system_x_url)
+                    bool_resp2, system_x = self.get_resource(system_x_url, select=["Storage", "SimpleStorage"])
                     if bool_resp2 == True:
-                        if "Storage" in response_system_x_url.dict:
-                            storage_url = response_system_x_url.dict["Storage"]["@odata.id"]
+                        if "Storage" in system_x:
+                            storage_url = system_x["Storage"]["@odata.id"]
                         else:
-                            storage_url = response_system_x_url.dict["SimpleStorage"]["@odata.id"]
-                        bool_resp3, response_storage_url = self.redfish_response("get", storage_url)
+                            storage_url = system_x["SimpleStorage"]["@odata.id"]
+                        # Storage members, their drives and volumes come in one response where $expand is supported
+                        bool_resp3, storage_collection = self.get_resource(storage_url, levels=3)
                         if bool_resp3 == True:
-                            for i in range(0, len(response_storage_url.dict["Members"])):
-                                storage_i_url = response_storage_url.dict["Members"][i]["@odata.id"]
-                                bool_resp4, response_storage_i_url = self.redfish_response("get", storage_i_url)
-                                if bool_resp4 == True:
-                                    storage = {}
-                                    storage["Id"] = response_storage_i_url.dict["Id"]
-                                    storage["Name"] = response_storage_i_url.dict["Name"]
-                                    drives_list = []
-                                    if "Drives" in response_storage_i_url.dict:
-                                        for member in response_storage_i_url.dict["Drives"]:
-                                            drive_inv = {}
-                                            drive_url = member["@odata.id"]
-                                            bool_resp5, response_drive_url = self.redfish_response("get", drive_url)
-                                            if bool_resp5 == True:
-                                                for key in response_drive_url.dict:
-                                                    if key not in ["Description", "@odata.context", "@odata.id",
-                                                                   "@odata.id", "@odata.type", "Links", "Actions",
-                                                                   "RelatedItem"]:
-                                                        drive_inv[key] = response_drive_url.dict[key]
-                                                drives_list.append(drive_inv)
-                                            else:
-                                                raise Exception("Failed")
-                                    storage["Devices"] = drives_list
-                                    volumes_list = []
-                                    if "Volumes" in response_storage_i_url.dict:
-                                        volumes_url = response_storage_i_url.dict["Volumes"]["@odata.id"]
-                                        bool_resp6, response_volumes_url = self.redfish_response("get", volumes_url)
-                                        if bool_resp6 == True:
-                                            for member in response_volumes_url.dict["Members"]:
-                                                vol_inv = {}
-                                                vol_url = member["@odata.id"]
-                                                bool_resp7, response_vol_url = self.redfish_response("get", vol_url)
-                                                if bool_resp7 == True:
-                                                    for key in response_vol_url.dict:
-                                                        if key not in ["Description", "@odata.context", "@odata.id",
-                                                                       "@odata.id", "@odata.type", "Links", \
-                                                                       "Actions", "RelatedItem"]:
-                                                            vol_inv[key] = response_vol_url.dict[key]
-                                                    volumes_list.append(vol_inv)
-                                                else:
-                                                    raise Exception("Failed")
-                                        else:
+                            bool_resp4, storage_members = self.fetch_links(storage_collection["Members"])
+                            if bool_resp4 == False:
+                                raise Exception("Failed")
+                            for storage_i in storage_members:
+                                storage = {}
+                                storage["Id"] = storage_i["Id"]
+                                storage["Name"] = storage_i["Name"]
+                                drives_list = []
+                                if "Drives" in storage_i:
+                                    bool_resp5, drives = self.fetch_links(storage_i["Drives"])
+                                    if bool_resp5 == False:
+                                        raise Exception("Failed")
+                                    for drive in drives:
+                                        drive_inv = {}
+                                        for key in drive:
+                                            if key not in ["Description", "@odata.context", "@odata.id",
+                                                           "@odata.id", "@odata.type", "Links", "Actions",
+                                                           "RelatedItem"]:
+                                                drive_inv[key] = drive[key]
+                                        drives_list.append(drive_inv)
+                                storage["Devices"] = drives_list
+                                volumes_list = []
+                                if "Volumes" in storage_i:
+                                    bool_resp6, volumes = self.resolve_link(storage_i["Volumes"])
+                                    if bool_resp6 == True:
+                                        bool_resp7, volume_members = self.fetch_links(volumes["Members"])
+                                        if bool_resp7 == False:
                                             raise Exception("Failed")
-                                    storage["Volumes"] = volumes_list
-                                    storageControllerCount = response_storage_i_url.dict[
-                                        "StorageControllers@odata.count"]
-                                    stoConList = []
-                                    for i in range(0, storageControllerCount):
-                                        con_dict = {}
-                                        for key in response_storage_i_url.dict["StorageControllers"][i]:
-                                            if key not in ["Description", "@odata.context", "@odata.id", "@odata.id",
-                                                           "@odata.type", "Links", "Actions", "RelatedItem"]:
-                                                con_dict[key] = response_storage_i_url.dict["StorageControllers"][i][
-                                                    key]
-                                        stoConList.append(con_dict)
-                                    storage["Storage Controllers"] = stoConList
-                                    storage_details.append(storage)
-                                else:
-                                    raise Exception("Failed")
+                                        for volume in volume_members:
+                                            vol_inv = {}
+                                            for key in volume:
+                                                if key not in ["Description", "@odata.context", "@odata.id",
+                                                               "@odata.id", "@odata.type", "Links", \
+                                                               "Actions", "RelatedItem"]:
+                                                    vol_inv[key] = volume[key]
+                                            volumes_list.append(vol_inv)
+                                    else:
+                                        raise Exception("Failed")
+                                storage["Volumes"] = volumes_list
+                                storageControllerCount = storage_i["StorageControllers@odata.count"]
+                                stoConList = []
+                                for i in range(0, storageControllerCount):
+                                    con_dict = {}
+                                    for key in storage_i["StorageControllers"][i]:
+                                        if key not in ["Description", "@odata.context", "@odata.id", "@odata.id",
+                                                       "@odata.type", "Links", "Actions", "RelatedItem"]:
+                                            con_dict[key] = storage_i["StorageControllers"][i][key]
+                                    stoConList.append(con_dict)
+                                storage["Storage Controllers"] = stoConList
+                                storage_details.append(storage)
                         else:
                             raise Exception("Failed")
                     else:
@@ -698,6 +1218,7 @@ class RedfishApi:
             logger.error("error_msg: {}".format(e))
             return False, storage_details
 
+    @bind_context
     def set_power_limit(self,power_limit=500):
         """
         Method to set the power limit
@@ -708,7 +1229,7 @@ class RedfishApi:
                logger.info("system manufacturer is {}".format(self.system_manufacturer))
                power_url=self.config_dict["power_url"]
                logger.info(power_url)
-               bool_resp1,response_power_url=self.redfish_response("get",power_url)
+               bool_resp1,response_power_url=self.redfish_response("get",power_url,max_age=0)
                #logger.info(response_power_url)
                if bool_resp1==True:
                    #validating json schema
@@ -755,6 +1276,7 @@ class RedfishApi:
             logger.error("error msg: {}".format(e))
             return False,None
     
+    @bind_context
     def execute_power_exceptions(self):
         """
 	    This API will collect the power consumptions of the system.
@@ -809,6 +1331,105 @@ class RedfishApi:
             logger.error("error msg: {}".format(e))
             return False
 
+    def select_system_urls(self, system_id=None):
+        """
+        Method to pick system urls from the discovered Systems collection, the same way get_system_url() does.
+        :param system_id: System id can be a particular id, or can be "all"(to get all system urls),or None(in that case system url for 1st system is returned).
+        :return: list of system urls, or None when the systems of the host are not discovered.
+        """
+        system_urls = self.current_context().system_urls
+        if not system_urls:
+            return None
+        if system_id == None:
+            return system_urls[:1]
+        if system_id == "all":
+            return list(system_urls)
+        return [system_url for system_url in system_urls if system_id in system_url][:1]
+
+    def reset_action(self, resource_url, action, max_age=None):
+        """
+        Method to get the reset action of a system or manager: its target and ResetType allowable values.
+        The action is read once per host and kept in the host context and the discovery cache.
+        :param resource_url: system or manager url
+        :param action: "#ComputerSystem.Reset" or "#Manager.Reset"
+        :param max_age: seconds a cached response of the resource may be reused, 0 reads it from the BMC.
+        :return: Bool, dict with "target" and "allowable" (None when the BMC doesn't list them)
+        """
+        ctx = self.current_context()
+        if ctx.reset_targets is None:
+            ctx.reset_targets = {}
+        if resource_url in ctx.reset_targets:
+            return True, ctx.reset_targets[resource_url]
+        bool_resp, response = self.redfish_response("get", resource_url, max_age=max_age)
+        if bool_resp == False:
+            return False, None
+        reset = response.dict["Actions"][action]
+        allowable = reset.get("ResetType@Redfish.AllowableValues")
+        if allowable is None and "@Redfish.ActionInfo" in reset:
+            bool_resp1, response_action_info = self.redfish_response("get", reset["@Redfish.ActionInfo"],
+                                                                     max_age=max_age)
+            if bool_resp1 == True:
+                for parameter in response_action_info.dict.get("Parameters", []):
+                    if parameter.get("Name") == "ResetType":
+                        allowable = parameter.get("AllowableValues")
+        ctx.reset_targets[resource_url] = {"target": reset["target"], "allowable": allowable}
+        self.save_reset_targets(ctx)
+        return True, ctx.reset_targets[resource_url]
+
+    def invalidate_reset_action(self, resource_url):
+        """
+        Method to forget the cached reset action of a system or manager, i.e after its POST failed.
+        :param resource_url: system or manager url
+        :return: None
+        """
+        ctx = self.current_context()
+        if ctx.reset_targets and ctx.reset_targets.pop(resource_url, None) is not None:
+            self.save_reset_targets(ctx)
+
+    def save_reset_targets(self, ctx):
+        """
+        Method to store the reset actions of a host in its discovery cache entry.
+        :param ctx: HostContext of the host.
+        :return: None
+        """
+        discovery_cache = getattr(self, "discovery_cache", None)
+        if discovery_cache is not None:
+            discovery_cache.update(ctx.login_host, "reset_targets", ctx.reset_targets)
+
+    def post_reset(self, resource_url, action, reset_type, headers=None):
+        """
+        Method to POST a reset action using the cached target, so the common case is a single request.
+        If the BMC rejects the POST with 400, 404 or 405 the target is read again from the BMC, and the POST is repeated
+        once only when the target changed (a stale cached target). A reset rejected by its target itself, i.e not
+        allowed in the current power state, and a POST the BMC accepted are never repeated.
+        :param resource_url: system or manager url
+        :param action: "#ComputerSystem.Reset" or "#Manager.Reset"
+        :param reset_type: ResetType of the POST body
+        :param headers: request headers
+        :return: Bool, response of the POST
+        """
+        bool_resp, reset = self.reset_action(resource_url, action)
+        for attempt in range(2):
+            if bool_resp == False:
+                return False, None
+            if reset["allowable"] and reset_type not in reset["allowable"]:
+                logger.error("ResetType {} is not supported by {}, allowable values: {}".format(
+                    reset_type, resource_url, reset["allowable"]))
+                return False, None
+            bool_resp1, response = self.redfish_response("post", reset["target"], {"ResetType": reset_type}, headers)
+            if bool_resp1 == True:
+                return True, response
+            if attempt == 1 or getattr(response, "status", None) not in [400, 404, 405]:
+                break
+            failed_target = reset["target"]
+            self.invalidate_reset_action(resource_url)
+            bool_resp, reset = self.reset_action(resource_url, action, max_age=0)
+            if bool_resp == False or reset["target"] == failed_target:
+                break
+            logger.info("reset target of {} changed, posting {} again".format(resource_url, reset_type))
+        return False, response
+
+    @bind_context
     def set_reset_type(self,reset_typ):
         """
         Method to set reset type of specified system.
@@ -819,24 +1440,20 @@ class RedfishApi:
         try:
             system_id = self.config_dict["system_id"]
             self.add_data(self.set_reset_type.__name__)
-            bool_resp, response_base_url = self.get_base_url_response()
-            if bool_resp == False:
-                raise Exception("Failed")
-            system_url = response_base_url.dict["Systems"]["@odata.id"]
-            bool_resp1, system = self.get_system_url(system_url, system_id)
+            system = self.select_system_urls(system_id)
+            bool_resp1 = bool(system)
+            if system is None:
+                bool_resp, response_base_url = self.get_base_url_response()
+                if bool_resp == False:
+                    raise Exception("Failed")
+                system_url = response_base_url.dict["Systems"]["@odata.id"]
+                bool_resp1, system = self.get_system_url(system_url, system_id)
             if bool_resp1 == True:
                 for i in range(len(system)):
                     system_x_url = system[i]
                     print("system_x_url is",system_x_url)
-                    bool_respx, response_system_x_url = self.redfish_response("get", system_x_url)
-                    if bool_respx == False:
-                        raise Exception("Failed")
-                    # Find the Reset Action target URL
-                    target_url = response_system_x_url.dict["Actions"]["#ComputerSystem.Reset"]["target"]
-                    # Prepare POST body
-                    post_body = {"ResetType": reset_typ}
-                    # POST Reset Action
-                    bool_resp2, result = self.redfish_response("post", target_url, post_body)
+                    # POST Reset Action to the cached target
+                    bool_resp2, result = self.post_reset(system_x_url, "#ComputerSystem.Reset", reset_typ)
                     if bool_resp2 != True:
                         raise Exception("Failed")
                 return True, result
@@ -847,6 +1464,7 @@ class RedfishApi:
             logger.error("error msg: {}".format(e))
             return False, None
 
+    @bind_context
     def set_network_protocol(self):
         """
         Method to set network protocol(i.e to enable or disable a BMC service and also to change port numbers of those services).
@@ -900,33 +1518,48 @@ class RedfishApi:
             logger.error("error msg= {}".format(e))
             return False, None
 
-    def add_event_subscription(self, dest, subs_type="Event", context="", protocol="Redfish"):
+    @bind_context
+    def get_event_service(self):
+        """
+        Method to get the EventService resource of the BMC.
+        :return: Bool, EventService response
+        """
+        bool_resp, response_base_url = self.get_base_url_response()
+        if bool_resp == False or "EventService" not in response_base_url.dict:
+            return False, None
+        return self.redfish_response("get", response_base_url.dict["EventService"]["@odata.id"])
+
+    def event_service_version(self, event_service):
+        """
+        Method to get the schema version of an EventService resource.
+        :param event_service: EventService dict
+        :return: int i.e 160 for v1_6_0, 130 when the version is unknown
+        """
+        event_service_type = event_service.get("@odata.type", "").split('.')
+        if len(event_service_type) > 2 and event_service_type[-2].startswith('v'):
+            return int(event_service_type[-2].replace('v', '').replace('_', ''))
+        return 130  # default version v1_3_0
+
+    @bind_context
+    def add_event_subscription(self, dest=None, subs_type=None, context=None, protocol=None):
         """
         Method to create subscription for Redfish service to sen event to subscriber.
-        :param dest: URI to the destination where events will be sent.
-        :param subs_type: subscriber event format type.
-        :param context: client suppplied context for event.
-        :param protocol: protocol of destination.
+        :param dest: URI to the destination where events will be sent, default config "dest".
+        :param subs_type: subscriber event format type, default config "subs_type".
+        :param context: client suppplied context for event, default config "context".
+        :param protocol: protocol of destination, default config "protocol".
         :return: Bool, response body for post request for adding subscriptions.
         """
         try:
-            dest = self.config_dict["dest"]
-            subs_type = self.config_dict["subs_type"]
-            context = self.config_dict["context"]
-            protocol = self.config_dict["protocol"]
+            dest = self.config_dict["dest"] if dest is None else dest
+            subs_type = self.config_dict["subs_type"] if subs_type is None else subs_type
+            context = self.config_dict["context"] if context is None else context
+            protocol = self.config_dict["protocol"] if protocol is None else protocol
             self.add_data(self.add_event_subscription.__name__)
-            bool_resp, response_base_url = self.get_base_url_response()
-            if bool_resp == False:
+            bool_resp1, response_event_url = self.get_event_service()
+            if bool_resp1 == False:
                 raise Exception("Failed")
-            event_url = response_base_url.dict["EventService"]["@odata.id"]
-            bool_resp1, response_event_url = self.redfish_response("get", event_url)
-            if bool_resp1 == True:
-                event_service_version = 130  # default version v1_3_0
-                event_service_type = response_event_url.dict["@odata.type"]
-                event_service_type = event_service_type.split('.')[-2]
-                if event_service_type.startswith('v'):
-                    event_service_version = int(event_service_type.replace('v', '').replace('_', ''))
-            # print(event_service_version)
+            event_service_version = self.event_service_version(response_event_url.dict)
             subs_url = response_event_url.dict["Subscriptions"]["@odata.id"]
             bool_resp2, response_subs_url = self.redfish_response("get", subs_url)
             if bool_resp2 == True:
@@ -1015,6 +1648,37 @@ class RedfishApi:
             logger.error("error msg:{}".format(e))
             return False, None
 
+    def create_event_listener(self, queue=None):
+        """
+        Method to create the receiver of the events pushed by the BMCs, from config "event_listener_host",
+        "event_listener_port", "event_listener_certfile"/"event_listener_keyfile" (HTTPS) and "event_dedup_size".
+        :param queue: queue.Queue receiving the events, optional.
+        :return: EventListener, not started yet.
+        """
+        return EventListener(host=self.config_dict.get("event_listener_host", "0.0.0.0"),
+                             port=self.config_dict.get("event_listener_port", 8443),
+                             certfile=self.config_dict.get("event_listener_certfile") or None,
+                             keyfile=self.config_dict.get("event_listener_keyfile") or None,
+                             dedup_size=self.config_dict.get("event_dedup_size", 10000), queue=queue)
+
+    def subscribe_fleet_events(self, dest=None, subs_type="Event"):
+        """
+        Method to subscribe the event receiver on all configured systems. The login host is the Context of each
+        subscription, so received events can be mapped back to the configured system.
+        :param dest: URI of the receiver as seen by the BMCs, default config "event_listener_destination".
+        :param subs_type: "Event" or "MetricReport".
+        :return: dict login_host: Bool
+        """
+        dest = dest or self.config_dict.get("event_listener_destination")
+        results = {}
+        for ctx in self.contexts:
+            bool_resp, result = self.add_event_subscription(dest=dest, subs_type=subs_type, context=ctx.login_host,
+                                                            protocol="Redfish", ctx=ctx)
+            self.html_results = self.html_results + ctx.drain_report()
+            results[ctx.login_host] = bool_resp
+        return results
+
+    @bind_context
     def delete_event_subscription(self):
         """
         Method to delete first found event subscription for passed destination.
@@ -1024,11 +1688,7 @@ class RedfishApi:
         try:
             dest = self.config_dict["ddest"]
             self.add_data(self.delete_event_subscription.__name__)
-            bool_resp, response_base_url = self.get_base_url_response()
-            if bool_resp == False:
-                raise Exception("Failed")
-            event_url = response_base_url.dict["EventService"]["@odata.id"]
-            bool_respx, response_event_url = self.redfish_response("get", event_url)
+            bool_respx, response_event_url = self.get_event_service()
             if bool_respx == False:
                 raise Exception("Failed")
             subs_url = response_event_url.dict["Subscriptions"]["@odata.id"]
@@ -1059,6 +1719,7 @@ class RedfishApi:
             logger.error("error msg:{}".format(e))
             return False, None
 
+    @bind_context
     def post_test_event(self):
         """
         Method to send test event to subscribers.
@@ -1075,17 +1736,10 @@ class RedfishApi:
             sev_list = ["OK", "Warning", "Critical"]
             if severity not in sev_list:
                 raise Exception("Please check as severity input as its scope is in 'OK,Warning,Critical' only.")
-            bool_resp, response_base_url = self.get_base_url_response()
-            if bool_resp == False:
-                raise Exception("Failed")
-            event_url = response_base_url.dict["EventService"]["@odata.id"]
-            bool_resp1, response_event_url = self.redfish_response("get", event_url)
+            bool_resp1, response_event_url = self.get_event_service()
             if bool_resp1 == True:
-                event_service_version = 130  # default version v1_3_0
-                event_service_type = response_event_url.dict["@odata.type"]
-                event_service_type = event_service_type.split('.')[-2]
-                if event_service_type.startswith('v'):
-                    event_service_version = int(event_service_type.replace('v', '').replace('_', ''))
+                event_url = response_event_url.dict["@odata.id"]
+                event_service_version = self.event_service_version(response_event_url.dict)
                 event_target_url = response_event_url.dict["Actions"]["#EventService.SubmitTestEvent"]["target"]
                 timestamp = datetime.datetime.now().strftime('%Y-%m-%dT%H:%M:%S+08:00')
                 headers = {"Content-Type": "application/json"}
@@ -1158,6 +1812,7 @@ class RedfishApi:
             logger.error("error msg: {}".format(e))
             return False, None
 
+    @bind_context
     def get_fans_inventory(self):
         """
         Method to get fans inventory from chassis.
@@ -1205,6 +1860,7 @@ class RedfishApi:
             logger.error("error_msg: {}".format(e))
             return False, None
 
+    @bind_context
     def reset_manager(self):
         """
         Method to restart BMC.
@@ -1214,30 +1870,28 @@ class RedfishApi:
         try:
             manager_reset_type = self.config_dict["manager_reset_type"]
             self.add_data(self.reset_manager.__name__)
-            bool_resp, response_base_url = self.get_base_url_response()
-            if bool_resp == False:
-                raise Exception("Failed")
-            managers_url = response_base_url.dict["Managers"]["@odata.id"]
-            bool_respx, response_managers_url = self.redfish_response("get", managers_url)
-            if bool_respx == False:
-                raise Exception("Failed")
-            for bmc in response_managers_url.dict["Members"]:
-                bmc_url = bmc["@odata.id"]
-                bool_resp1, response_bmc_url = self.redfish_response("get", bmc_url)
-                if bool_resp1 == True:
-                    reset_bmc_url = response_bmc_url.dict["Actions"]["#Manager.Reset"]["target"]
-                    body = {"ResetType": manager_reset_type}
-                    headers = {"Content-Type": "application/json"}
-                    bool_resp2, response_manager_reset = self.redfish_response("post", reset_bmc_url, body, headers)
-                    if bool_resp2 == False:
-                        raise Exception("Failed")
-                else:
+            manager_urls = self.current_context().manager_urls
+            if not manager_urls:
+                bool_resp, response_base_url = self.get_base_url_response()
+                if bool_resp == False:
+                    raise Exception("Failed")
+                managers_url = response_base_url.dict["Managers"]["@odata.id"]
+                bool_respx, response_managers_url = self.redfish_response("get", managers_url)
+                if bool_respx == False:
+                    raise Exception("Failed")
+                manager_urls = [bmc["@odata.id"] for bmc in response_managers_url.dict["Members"]]
+            for bmc_url in manager_urls:
+                headers = {"Content-Type": "application/json"}
+                bool_resp2, response_manager_reset = self.post_reset(bmc_url, "#Manager.Reset", manager_reset_type,
+                                                                     headers)
+                if bool_resp2 == False:
                     raise Exception("Failed")
             return True, response_manager_reset
         except Exception as e:
             logger.error("error msg: {}".format(e))
             return False
 
+    @bind_context
     def get_psu_inventory(self):
         """
         Method to get power supply unit inventory.
@@ -1250,34 +1904,29 @@ class RedfishApi:
             if bool_resp == False:
                 raise Exception("Failed")
             chassis_url = response_base_url.dict["Chassis"]["@odata.id"]
-            bool_resp1, response_chassis_url = self.redfish_response("get", chassis_url)
+            bool_resp1, chassis_collection = self.get_resource(chassis_url, levels=1)
             if bool_resp1 == True:
-                for x in response_chassis_url.dict["Members"]:
-                    chassis_x_url = x["@odata.id"]
-                    bool_resp2, response_chassis_x_url = self.redfish_response("get", chassis_x_url)
-                    if bool_resp2 == True:
-                        if "Power" not in response_chassis_x_url.dict:
-                            continue
-                        power_url = response_chassis_x_url.dict["Power"]["@odata.id"]
-                        bool_respx, response_power_url = self.redfish_response("get", power_url)
-                        if bool_respx == False:
-                            raise Exception("Failed")
-                        else:
-                            if "PowerSupplies" not in response_power_url.dict:
-                                continue
-                            for x in response_power_url.dict["PowerSupplies"]:
-                                psu_dict = {}
-                                for key in x:
-                                    if key in ["Name", "SerialNumber", "PowerOutputWatts", "EfficiencyPercent",
-                                               "LineInputVoltage", "PartNumber", \
-                                               "FirmwareVersion", "PowerCapacityWatts", "PowerInputWatts", "Model",
-                                               "PowerSupplyType", "Status", "Manufacturer", \
-                                               "HotPluggable", "LastPowerOutputWatts", "InputRanges",
-                                               "LineInputVoltageType", "Location", "SparePartNumber"]:
-                                        psu_dict[key] = x[key]
-                                psu_inv_list.append(psu_dict)
-                    else:
-                        raise Exception("Failed")
+                bool_resp2, chassis_members = self.fetch_links(chassis_collection["Members"])
+                if bool_resp2 == False:
+                    raise Exception("Failed")
+                power_links = [chassis_x["Power"] for chassis_x in chassis_members if "Power" in chassis_x]
+                bool_respx, power_resources = self.fetch_links(power_links, select=["PowerSupplies"])
+                if bool_respx == False:
+                    raise Exception("Failed")
+                for power in power_resources:
+                    if "PowerSupplies" not in power:
+                        continue
+                    for x in power["PowerSupplies"]:
+                        psu_dict = {}
+                        for key in x:
+                            if key in ["Name", "SerialNumber", "PowerOutputWatts", "EfficiencyPercent",
+                                       "LineInputVoltage", "PartNumber", \
+                                       "FirmwareVersion", "PowerCapacityWatts", "PowerInputWatts", "Model",
+                                       "PowerSupplyType", "Status", "Manufacturer", \
+                                       "HotPluggable", "LastPowerOutputWatts", "InputRanges",
+                                       "LineInputVoltageType", "Location", "SparePartNumber"]:
+                                psu_dict[key] = x[key]
+                        psu_inv_list.append(psu_dict)
                 return True, psu_inv_list
             else:
                 raise Exception("Failed")
@@ -1286,115 +1935,669 @@ class RedfishApi:
             logger.error("error msg: {}".format(e))
             return False
 
-    def get_bmc_logs(self):
+    @bind_context
+    def get_log_services(self):
         """
-        Method to get BMC logs(i.e system event logs, lifecycle logs etc.)
-        :return: Bool, List of logs.
+        Method to get the log services of the BMCs that have log entries.
+        :return: Bool, list of log service dicts
         """
         try:
-            self.add_data(self.get_bmc_logs.__name__)
-            logs_list = []
+            log_services = []
             bool_resp, response_base_url = self.get_base_url_response()
             if bool_resp == False:
                 raise Exception("Failed")
             managers_url = response_base_url.dict["Managers"]["@odata.id"]
-            bool_respx, response_managers_url = self.redfish_response("get", managers_url)
+            bool_respx, managers = self.get_resource(managers_url, levels=1)
             if bool_respx == False:
                 raise Exception("Failed")
-            for bmc in response_managers_url.dict["Members"]:
-                bmc_url = bmc["@odata.id"]
-                bool_resp1, response_bmc_url = self.redfish_response("get", bmc_url)
+            for bmc in managers["Members"]:
+                bool_resp1, bmc_x = self.resolve_link(bmc)
                 if bool_resp1 == True:
-                    if "LogServices" in response_bmc_url.dict:
-                        log_services_url = response_bmc_url.dict["LogServices"]["@odata.id"]
-                        bool_resp2, response_log_services_url = self.redfish_response("get", log_services_url)
+                    if "LogServices" in bmc_x:
+                        log_services_url = bmc_x["LogServices"]["@odata.id"]
+                        bool_resp2, log_services_collection = self.get_resource(log_services_url, levels=1)
                         if bool_resp2 == True:
-                            for x in response_log_services_url.dict["Members"]:
-                                log_x_url = x["@odata.id"]
-                                bool_resp3, response_log_x_url = self.redfish_response("get", log_x_url)
-                                if bool_resp3 == True:
-                                    if "Entries" not in response_log_x_url.dict:
-                                        continue
-                                    entries_url = response_log_x_url.dict["Entries"]["@odata.id"]
-                                    bool_resp4, response_entries_url = self.redfish_response("get", entries_url)
-                                    if bool_resp4 == True:
-                                        for log in response_entries_url.dict["Members"]:
-                                            log_dict = {}
-                                            for key in ["Id", "Name", "Created", "Message", "MessageId", "Severity",
-                                                        "EntryCode", "EntryType", "EventId", "SensorNumber" \
-                                                    , "SensorType"]:
-                                                if key in log:
-                                                    log_dict[key] = log[key]
-                                            logs_list.append(log_dict)
-                                    else:
-                                        raise Exception("Failed")
-                                else:
-                                    raise Exception("Failed")
+                            bool_resp3, services = self.fetch_links(log_services_collection["Members"])
+                            if bool_resp3 == False:
+                                raise Exception("Failed")
+                            log_services.extend(service for service in services if "Entries" in service)
                         else:
                             raise Exception("Failed")
                     else:
                         raise Exception("Log service is not available")
                 else:
                     raise Exception("Failed")
+            return True, log_services
+        except Exception as e:
+            logger.error("error msg: {}".format(e))
+            return False, []
+
+    def log_created(self, created):
+        """
+        Method to parse the Created time of a log entry, times without offset are taken as UTC.
+        :param created: Created value of a log entry
+        :return: datetime or None
+        """
+        try:
+            created = datetime.fromisoformat(created.replace("Z", "+00:00"))
+        except Exception:
+            return None
+        return created if created.tzinfo else created.replace(tzinfo=timezone.utc)
+
+    def log_number(self, entry_id):
+        """
+        Method to get the number of a log entry Id, BMCs number the entries of a log upwards.
+        :param entry_id: Id of a log entry
+        :return: int or None for Ids that are not numbers
+        """
+        return int(entry_id) if isinstance(entry_id, str) and entry_id.isdigit() else None
+
+    def log_cleared(self, checkpoint, status):
+        """
+        Method to tell from the entry count and the highest entry number whether a log was cleared since the
+        checkpoint: both only go backwards when the BMC starts the log over.
+        :param checkpoint: checkpoint of the log service
+        :param status: dict with "count" and "last_id" filled by reading the log service
+        :return: Bool
+        """
+        for key in ["count", "last_id"]:
+            if checkpoint.get(key) is not None and status.get(key) is not None and status[key] < checkpoint[key]:
+                return True
+        return False
+
+    def read_log_entries(self, ctx=None, log_services=None, incremental=True):
+        """
+        Generator over the entries of the BMC log services, one page in memory at a time.
+        Pages are followed through Members@odata.nextLink, or $top/$skip ("log_page_size") when the BMC supports it,
+        with the entries inlined by $expand when the BMC supports it.
+        With incremental and "log_checkpoints" set only entries newer than the checkpoint of each log service are
+        read ($filter on Created when supported, by Id for entries without Created) and the checkpoint is moved once
+        a log service was read to its end. When the entry count or Ids went backwards the log was cleared and it is
+        read again from the start.
+        :param ctx: HostContext of the host, default the current context.
+        :param log_services: list of log service dicts, default get_log_services().
+        :param incremental: False reads all entries and leaves the checkpoints alone.
+        :return: generator of (log service url, log entry dict)
+        """
+        ctx = ctx or self.current_context()
+        if log_services is None:
+            bool_resp, log_services = self.get_log_services(ctx=ctx)
+            if bool_resp == False:
+                raise Exception("Failed to get the log services of {}".format(ctx.login_host))
+        checkpoints = self.log_checkpoints if incremental else None
+        for service in log_services:
+            service_url = service["@odata.id"]
+            checkpoint = checkpoints.get(ctx.login_host, service_url) if checkpoints is not None else None
+            yielded = set()
+            while True:
+                status = {}
+                newest, newest_created, newest_ids = None, None, []
+                for entry in self._read_log_service(ctx, service["Entries"]["@odata.id"], checkpoint, status):
+                    created = self.log_created(entry.get("Created"))
+                    if created is not None and (newest is None or created > newest):
+                        newest, newest_created, newest_ids = created, entry["Created"], [entry.get("Id")]
+                    elif created is not None and created == newest:
+                        newest_ids.append(entry.get("Id"))
+                    if entry.get("Id") in yielded:
+                        continue
+                    if checkpoint is not None:
+                        # only needed to not repeat the new entries when the log turns out to be cleared
+                        yielded.add(entry.get("Id"))
+                    yield service_url, entry
+                if checkpoint is None or not self.log_cleared(checkpoint, status):
+                    break
+                logger.info("{} of {} went backwards, the log was cleared, reading it from the start".format(
+                    service_url, ctx.login_host))
+                checkpoint = None
+            if checkpoints is None:
+                continue
+            new_checkpoint = dict(checkpoint or {"created": None, "ids": []})
+            if newest is not None:
+                if checkpoint is not None and checkpoint["created"] == newest_created:
+                    newest_ids = checkpoint["ids"] + newest_ids
+                new_checkpoint.update(created=newest_created, ids=newest_ids)
+            for key in ["count", "last_id"]:
+                if status.get(key) is not None:
+                    new_checkpoint[key] = status[key]
+            if new_checkpoint != checkpoint:
+                checkpoints.put(ctx.login_host, service_url, new_checkpoint)
+
+    def _read_log_service(self, ctx, entries_url, checkpoint, status):
+        since = self.log_created(checkpoint["created"]) if checkpoint else None
+        seen = set(checkpoint["ids"]) if checkpoint else set()
+        last_id = checkpoint.get("last_id") if checkpoint else None
+        status["last_id"] = None
+        features = ctx.protocol_features or {}
+        page_size = self.config_dict.get("log_page_size", 0) if features.get("top_skip") else 0
+        with self.use_context(ctx):
+            expand = self.query_params(levels=1)
+        # queries in the order they are given up when the BMC rejects them, $filter first
+        queries = []
+        if page_size:
+            queries.append(("top_skip", []))
+        if expand:
+            queries.append(("expand", expand))
+        if since is not None and features.get("filter"):
+            queries.append(("filter", ["$filter=" + quote("Created ge '{}'".format(checkpoint["created"]), safe="'")]))
+        with self.use_context(ctx):
+            while queries:
+                query = [parameter for feature, parameters in queries for parameter in parameters]
+                page_size = page_size if queries[0][0] == "top_skip" else 0
+                first_query = query + ["$top={}".format(page_size)] if page_size else query
+                bool_resp, response = self.probe_query(entries_url + "?" + "&".join(first_query),
+                                                       [queries[-1][0]], max_age=0)
+                if bool_resp == True:
+                    break
+                queries.pop()
+            else:
+                query, page_size = [], 0
+                bool_resp, response = self.redfish_response("get", entries_url, max_age=0)
+            if bool_resp == False:
+                raise Exception("Failed to read {}".format(entries_url))
+        filtered = bool(queries) and queries[-1][0] == "filter"
+        status["count"] = None if filtered else response.dict.get("Members@odata.count")
+        fetched = 0
+        newest_first = None
+        while True:
+            page = response.dict
+            with self.use_context(ctx):
+                bool_resp, members = self.fetch_links(page.get("Members", []))
+            if bool_resp == False:
+                raise Exception("Failed to read the entries of {}".format(entries_url))
+            fetched += len(members)
+            if newest_first is None and len(members) > 1:
+                first = self.log_created(members[0].get("Created"))
+                last = self.log_created(members[-1].get("Created"))
+                newest_first = first is not None and last is not None and first > last
+            for entry in members:
+                number = self.log_number(entry.get("Id"))
+                if number is not None and (status["last_id"] is None or number > status["last_id"]):
+                    status["last_id"] = number
+                created = self.log_created(entry.get("Created"))
+                if since is not None and created is not None:
+                    if created < since:
+                        if newest_first and not filtered:
+                            # the remaining entries are older still
+                            return
+                        continue
+                    if created == since and entry.get("Id") in seen:
+                        continue
+                elif created is None and last_id is not None and number is not None and number <= last_id:
+                    # without Created the entries are ordered by Id
+                    continue
+                yield entry
+            next_url = page.get("Members@odata.nextLink")
+            if next_url is None and page_size and members and fetched < page.get("Members@odata.count", 0):
+                next_url = entries_url + "?" + "&".join(query + ["$top={}".format(page_size),
+                                                                 "$skip={}".format(fetched)])
+            if next_url is None:
+                return
+            with self.use_context(ctx):
+                bool_resp, response = self.redfish_response("get", next_url, max_age=0)
+            if bool_resp == False:
+                raise Exception("Failed to read {}".format(next_url))
+
+    @bind_context
+    def get_bmc_logs(self):
+        """
+        Method to get BMC logs(i.e system event logs, lifecycle logs etc.)
+        :return: Bool, List of logs.
+        """
+        try:
+            self.add_data(self.get_bmc_logs.__name__)
+            logs_list = []
+            bool_resp, log_services = self.get_log_services()
+            if bool_resp == False:
+                raise Exception("Failed")
+            entries = []
+            for log_service, log in self.read_log_entries(log_services=log_services, incremental=False):
+                if self.log_store is not None:
+                    entries.append((log_service, log))
+                log_dict = {}
+                for key in ["Id", "Name", "Created", "Message", "MessageId", "Severity",
+                            "EntryCode", "EntryType", "EventId", "SensorNumber" \
+                        , "SensorType"]:
+                    if key in log:
+                        log_dict[key] = log[key]
+                logs_list.append(log_dict)
+            if self.log_store is not None:
+                self.log_store.ingest(self.current_context().login_host, entries)
             return True, logs_list
         except Exception as e:
             # traceback.print_exc()
             logger.error("error msg: {}".format(e))
             return False
 
+    def collect_host_logs(self, ctx):
+        """
+        Method to store the new log entries of one configured system in the log store.
+        :param ctx: HostContext of the system.
+        :return: number of new entries, None on failure.
+        """
+        try:
+            return self.log_store.ingest(ctx.login_host, self.read_log_entries(ctx=ctx))
+        except Exception as e:
+            logger.error("system {} error msg: {}".format(ctx.login_host, e))
+            return None
+
+    def collect_fleet_logs(self):
+        """
+        Method to store the new log entries of all configured systems in the log store ("log_store"), with
+        "log_checkpoints" set only the entries added since the last collection are read.
+        Hosts are read in parallel with "fleet_workers", on a pool of their own so a long log read doesn't hold up the
+        power polling. Hosts not done within "log_collection_timeout" seconds are left out, and skipped in the
+        following collections until their read has finished.
+        :return: dict login_host: number of new entries, None for hosts that failed or timed out.
+        """
+        if self.log_store is None:
+            logger.error("config \"log_store\" is not set")
+            return {}
+        workers = self.config_dict.get("fleet_workers", 1)
+        if workers > 1:
+            if self.log_executor is None:
+                self.log_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="fleet-logs")
+            futures = {}
+            for ctx in self.contexts:
+                previous = self.log_futures.get(ctx.login_host)
+                if previous is not None and not previous.done():
+                    logger.error("system {} is still reading the logs of a previous collection, skipping".format(
+                        ctx.login_host))
+                    continue
+                futures[ctx.login_host] = self.log_futures[ctx.login_host] = self.log_executor.submit(
+                    self.collect_host_logs, ctx)
+            wait(futures.values(), timeout=self.config_dict.get("log_collection_timeout", None))
+            out = {}
+            for ctx in self.contexts:
+                future = futures.get(ctx.login_host)
+                if future is not None and not future.done():
+                    logger.error("system {} did not finish reading its logs in time, skipping".format(ctx.login_host))
+                out[ctx.login_host] = future.result() if future is not None and future.done() else None
+            return out
+        return {ctx.login_host: self.collect_host_logs(ctx) for ctx in self.contexts}
+
+    def query_logs(self, login_host=None, hours=None, severity=None, message_id=None, sensor_type=None, limit=None):
+        """
+        Method to find log entries of the fleet in the log store, without requests to the BMCs.
+        i.e query_logs(hours=24, severity="Critical", message_id="%PSU%")
+        :param login_host: host ip or name, or a list of them, None for all hosts.
+        :param hours: only entries created in the last hours.
+        :param severity: "OK", "Warning", "Critical" or a list of them.
+        :param message_id: MessageId, with "%" as wildcard.
+        :param sensor_type: SensorType of the entries.
+        :param limit: maximum number of entries.
+        :return: Bool, list of entries newest first (see LogStore.query)
+        """
+        try:
+            if self.log_store is None:
+                raise Exception("config \"log_store\" is not set")
+            since = time.time() - hours * 3600 if hours else None
+            return True, self.log_store.query(login_host=login_host, since=since, severity=severity,
+                                              message_id=message_id, sensor_type=sensor_type, limit=limit)
+        except Exception as e:
+            logger.error("error msg: {}".format(e))
+            return False, []
+
+    @bind_context
     def power_usage(self):
         """
                 Method to get power usage.
                 :return: Bool, power usage.
         """
         try:
+            # chassis urls from host discovery spare the service root and chassis collection requests
+            chassis_members = self.current_context().chassis_urls
+            if not chassis_members:
+                bool_resp, response_base_url = self.get_base_url_response()
+                if bool_resp == False:
+                    raise Exception("Failed")
+                chassis_url = response_base_url.dict["Chassis"]["@odata.id"]
+                bool_resp1, response_chassis_url = self.redfish_response("get", chassis_url)
+                if bool_resp1 == False:
+                    raise Exception("Failed")
+                chassis_members = [x["@odata.id"] for x in response_chassis_url.dict["Members"]]
+            for chassis_x_url in chassis_members:
+                bool_resp2, response_chassis_x_url = self.redfish_response("get", chassis_x_url)
+                if bool_resp2 == True:
+                    if "Power" not in response_chassis_x_url.dict:
+                        continue
+                    power_url = response_chassis_x_url.dict["Power"]["@odata.id"]
+                    bool_respx, response_power_url = self.redfish_response("get", power_url, max_age=0)
+
+                    power_usage = response_power_url.dict["PowerControl"][0]["PowerConsumedWatts"]
+                    logger.info(power_usage)
+                    if self.redfish_version == "1.8.0":
+                        power_usage_list = [power_usage, "N/A","N/A","N/A"]
+                    else:
+                        power_metrics = response_power_url.dict["PowerControl"][0]["PowerMetrics"]
+                        power_usage_list = [power_usage, power_metrics["AverageConsumedWatts"],
+                                        power_metrics["MaxConsumedWatts"], power_metrics["MinConsumedWatts"]]
+                    power_state_resp = self.get_power_state()
+                    power_usage_list.append("Power " + power_state_resp[1][0]['PowerState'])
+                    logger.info(power_usage_list)
+                    return True, power_usage_list
+            logger.error("Error occurred while fetching power usage")
+
+        except Exception as e:
+            logger.error("Error occurred while fetching power usage,error msg: {}".format(e))
+            return False
+
+    @bind_context
+    def get_telemetry_service(self):
+        """
+        Method to get the TelemetryService resource of the BMC.
+        :return: Bool, TelemetryService response
+        """
+        bool_resp, response_base_url = self.get_base_url_response()
+        if bool_resp == False or "TelemetryService" not in response_base_url.dict:
+            return False, None
+        return self.redfish_response("get", response_base_url.dict["TelemetryService"]["@odata.id"])
+
+    def power_metric_properties(self):
+        """
+        Method to list the metric properties of the power consumption and temperature readings of the host.
+        :return: list of metric property uris (i.e "/redfish/v1/Chassis/1/Power#/PowerControl/0/PowerConsumedWatts")
+        """
+        chassis_members = self.current_context().chassis_urls
+        if not chassis_members:
             bool_resp, response_base_url = self.get_base_url_response()
             if bool_resp == False:
                 raise Exception("Failed")
-            chassis_url = response_base_url.dict["Chassis"]["@odata.id"]
-            bool_resp1, response_chassis_url = self.redfish_response("get", chassis_url)
-            if bool_resp1 == True:
-                for x in response_chassis_url.dict["Members"]:
-                    chassis_x_url = x["@odata.id"]
-                    bool_resp2, response_chassis_x_url = self.redfish_response("get", chassis_x_url)
-                    if bool_resp2 == True:
-                        if "Power" not in response_chassis_x_url.dict:
-                            continue
-                        power_url = response_chassis_x_url.dict["Power"]["@odata.id"]
-                        bool_respx, response_power_url = self.redfish_response("get", power_url)
-
-                        power_usage = response_power_url.dict["PowerControl"][0]["PowerConsumedWatts"]
-                        logger.info(power_usage)
-                        if self.redfish_version == "1.8.0":
-                            power_usage_list = [power_usage, "N/A","N/A","N/A"]
-                        else:
-                            power_metrics = response_power_url.dict["PowerControl"][0]["PowerMetrics"]
-                            power_usage_list = [power_usage, power_metrics["AverageConsumedWatts"],
-                                            power_metrics["MaxConsumedWatts"], power_metrics["MinConsumedWatts"]]
-                        power_state_resp = self.get_power_state()
-                        power_usage_list.append("Power " + power_state_resp[1][0]['PowerState'])
-                        logger.info(power_usage_list)
-                        return True, power_usage_list
-            else:
-                logger.error("Error occurred while fetching power usage")
+            bool_resp1, response_chassis_url = self.redfish_response(
+                "get", response_base_url.dict["Chassis"]["@odata.id"])
+            if bool_resp1 == False:
+                raise Exception("Failed")
+            chassis_members = [x["@odata.id"] for x in response_chassis_url.dict["Members"]]
+        bool_resp2, chassis = self.fetch_links([{"@odata.id": url} for url in chassis_members])
+        if bool_resp2 == False:
+            raise Exception("Failed")
+        properties = []
+        thermal_urls = []
+        for chassis_x in chassis:
+            if "Power" in chassis_x:
+                properties.append(chassis_x["Power"]["@odata.id"] + "#/PowerControl/0/PowerConsumedWatts")
+            if "Thermal" in chassis_x:
+                thermal_urls.append(chassis_x["Thermal"]["@odata.id"])
+        bool_resp3, thermals = self.fetch_links([{"@odata.id": url} for url in thermal_urls],
+                                                select=["Temperatures"])
+        if bool_resp3 == False:
+            raise Exception("Failed")
+        for thermal_url, thermal in zip(thermal_urls, thermals):
+            for index, temperature in enumerate(thermal.get("Temperatures", [])):
+                if "ReadingCelsius" in temperature:
+                    properties.append("{}#/Temperatures/{}/ReadingCelsius".format(thermal_url, index))
+        return properties
 
+    @bind_context
+    def ensure_metric_report(self):
+        """
+        Method to find the MetricReport of the host holding PowerConsumedWatts readings. When no enabled
+        MetricReportDefinition reports it, one is created ("telemetry_report_id") for the power and temperature
+        readings, every "telemetry_interval" seconds keeping the last "telemetry_append_limit" readings, so one GET
+        returns many samples. The report url is kept in the host context and the discovery cache.
+        :return: Bool, MetricReport url
+        """
+        try:
+            ctx = self.current_context()
+            if ctx.metric_report_url:
+                return True, ctx.metric_report_url
+            bool_resp, response_telemetry = self.get_telemetry_service()
+            if bool_resp == False:
+                raise Exception("TelemetryService is not available")
+            telemetry = response_telemetry.dict
+            definitions_url = telemetry["MetricReportDefinitions"]["@odata.id"]
+            bool_resp1, definitions = self.get_resource(definitions_url, levels=1)
+            if bool_resp1 == False:
+                raise Exception("Failed")
+            bool_resp2, definitions = self.fetch_links(definitions.get("Members", []))
+            if bool_resp2 == False:
+                raise Exception("Failed")
+            report_url = None
+            for definition in definitions:
+                metrics = definition.get("MetricProperties", []) + [
+                    "{} {}".format(metric.get("MetricId"), metric.get("MetricProperties"))
+                    for metric in definition.get("Metrics", [])]
+                if (definition.get("MetricReportDefinitionEnabled", True) and "MetricReport" in definition.get(
+                        "Links", {}) and any("PowerConsumedWatts" in metric for metric in metrics)):
+                    report_url = definition["Links"]["MetricReport"]["@odata.id"]
+                    break
+            if report_url is None:
+                report_id = self.config_dict.get("telemetry_report_id", "TritonPowerThermal")
+                body = {"Id": report_id,
+                        "Name": "Power and thermal readings",
+                        "MetricReportDefinitionType": "Periodic",
+                        "Schedule": {"RecurrenceInterval": "PT{}S".format(
+                            self.config_dict.get("telemetry_interval", 5))},
+                        "ReportActions": ["LogToMetricReportsCollection", "RedfishEvent"],
+                        "ReportUpdates": "AppendWrapsWhenFull",
+                        "AppendLimit": self.config_dict.get("telemetry_append_limit", 120),
+                        "MetricProperties": self.power_metric_properties()}
+                bool_resp3, response = self.redfish_response("post", definitions_url, body=body,
+                                                             headers={"Content-Type": "application/json"})
+                if bool_resp3 == False:
+                    raise Exception("Failed to create the MetricReportDefinition {}".format(report_id))
+                logger.info("{} created MetricReportDefinition {}".format(ctx.login_host, report_id))
+                try:
+                    report_url = response.dict["Links"]["MetricReport"]["@odata.id"]
+                except Exception:
+                    report_url = telemetry["MetricReports"]["@odata.id"].rstrip("/") + "/" + report_id
+            ctx.metric_report_url = report_url
+            discovery_cache = getattr(self, "discovery_cache", None)
+            if discovery_cache is not None:
+                discovery_cache.update(ctx.login_host, "metric_report_url", report_url)
+            return True, report_url
         except Exception as e:
-            logger.error("Error occurred while fetching power usage,error msg: {}".format(e))
+            logger.error("error msg: {}".format(e))
+            return False, None
+
+    def metric_report_readings(self, report):
+        """
+        Method to group the numeric MetricValues of a MetricReport by metric property.
+        :param report: MetricReport dict
+        :return: dict metric property (or MetricId): list of (timestamp, value) in time order
+        """
+        readings = {}
+        for metric_value in report.get("MetricValues", []):
+            try:
+                value = float(metric_value.get("MetricValue"))
+            except (TypeError, ValueError):
+                continue
+            key = metric_value.get("MetricProperty") or metric_value.get("MetricId")
+            timestamp = created_timestamp(metric_value.get("Timestamp") or report.get("Timestamp") or "")
+            readings.setdefault(key, []).append((timestamp or 0.0, value))
+        for values in readings.values():
+            values.sort(key=lambda reading: reading[0])
+        return readings
+
+    def handle_metric_report(self, event):
+        """
+        Callback for EventDispatcher.subscribe(kind="MetricReport"): keeps the pushed report of a configured system
+        for telemetry_power_usage(), when it is the report found by ensure_metric_report(). Other reports the BMC
+        pushes (i.e of definitions made by other tools) are dropped.
+        :param event: ReceivedEvent, its context or sender is the login host.
+        :return: None
+        """
+        for ctx in self.contexts:
+            if ctx.login_host in [event.context, event.sender]:
+                if not self.is_metric_report_of(ctx, event.data):
+                    logger.info("MetricReport {} of system {} is not its power report, dropped".format(
+                        event.data.get("@odata.id", event.data.get("Id")), ctx.login_host))
+                    return
+                ctx.metric_report = (event.received_at, event.data)
+                return
+        logger.info("MetricReport of unknown system {} dropped".format(event.context or event.sender))
+
+    def is_metric_report_of(self, ctx, report):
+        """
+        Method to check that a MetricReport is the report at the metric_report_url of a host, by its @odata.id or,
+        for reports pushed without one, by its MetricReportDefinition (a report has the Id of its definition).
+        :param ctx: HostContext of the host.
+        :param report: MetricReport dict
+        :return: Bool
+        """
+        if not ctx.metric_report_url:
             return False
+        report_url = ctx.metric_report_url.rstrip("/")
+        if "@odata.id" in report:
+            return report["@odata.id"].rstrip("/") == report_url
+        definition_url = report.get("MetricReportDefinition", {}).get("@odata.id", "").rstrip("/")
+        return bool(definition_url) and definition_url.rsplit("/", 1)[-1] == report_url.rsplit("/", 1)[-1]
+
+    @bind_context
+    def read_metric_report(self):
+        """
+        Method to get the MetricReport of the host: the last pushed one while it is younger than two
+        "telemetry_interval", otherwise one GET of the report.
+        :return: Bool, MetricReport dict
+        """
+        ctx = self.current_context()
+        if ctx.metric_report is not None:
+            received_at, report = ctx.metric_report
+            if time.time() - received_at < 2 * self.config_dict.get("telemetry_interval", 5):
+                return True, report
+        bool_resp, report_url = self.ensure_metric_report()
+        if bool_resp == False:
+            return False, None
+        bool_resp1, response = self.redfish_response("get", report_url, max_age=0)
+        if bool_resp1 == False:
+            # the definition may have been deleted on the BMC, look it up again next time
+            ctx.metric_report_url = None
+            discovery_cache = getattr(self, "discovery_cache", None)
+            if discovery_cache is not None:
+                discovery_cache.update(ctx.login_host, "metric_report_url", None)
+            return False, None
+        return True, response.dict
 
+    @bind_context
+    def telemetry_power_usage(self):
+        """
+        Method to get power usage from the MetricReport of the host instead of the Power resource.
+        Current is the latest PowerConsumedWatts reading, average, max and min are taken over the readings in the
+        report.
+        :return: Bool, [current, average, max, min, power state] like power_usage
+        """
+        try:
+            bool_resp, report = self.read_metric_report()
+            if bool_resp == False:
+                raise Exception("Failed to read the MetricReport")
+            readings = self.metric_report_readings(report)
+            power = [values for key, values in readings.items() if "PowerConsumedWatts" in key]
+            if not power:
+                raise Exception("MetricReport has no PowerConsumedWatts reading")
+            watts = [value for timestamp, value in power[0]]
+            power_usage_list = [watts[-1], sum(watts) / len(watts), max(watts), min(watts)]
+            power_usage_list = [int(value) if value.is_integer() else round(value, 2) for value in power_usage_list]
+            power_state_resp = self.get_power_state()
+            power_usage_list.append("Power " + power_state_resp[1][0]['PowerState'])
+            logger.info(power_usage_list)
+            return True, power_usage_list
+        except Exception as e:
+            logger.error("Error occurred while fetching telemetry power usage,error msg: {}".format(e))
+            return False, None
+
+    @bind_context
+    def telemetry_temperatures(self):
+        """
+        Method to get the latest temperature readings of the host from its MetricReport.
+        :return: Bool, list of dicts with "MetricProperty", "ReadingCelsius" and "Timestamp"
+        """
+        bool_resp, report = self.read_metric_report()
+        if bool_resp == False:
+            return False, []
+        return True, [{"MetricProperty": key, "ReadingCelsius": values[-1][1], "Timestamp": values[-1][0]}
+                      for key, values in self.metric_report_readings(report).items() if "ReadingCelsius" in key]
+
+    def read_power_states(self):
+        """
+        Method to read the current PowerState of every system selected by "system_id", always from the BMC.
+        These are plain GETs for polling, they add no rows to the report.
+        :return: list of PowerState strings, None for a system that could not be read.
+        """
+        ctx = self.current_context()
+        self.ensure_system_identity(ctx)
+        power_states = []
+        for system_url in self.select_system_urls(self.config_dict["system_id"]) or []:
+            response = self.cached_get(system_url, 0)
+            if response.status in self.config_dict["response_codes"]["success"]:
+                power_states.append(response.dict.get("PowerState"))
+            else:
+                logger.info("reading PowerState of {} failed with response code {}".format(system_url,
+                                                                                          response.status))
+                power_states.append(None)
+        return power_states
+
+    def in_power_state(self, states):
+        """
+        Method to check that every system selected by "system_id" is in one of the given power states.
+        :param states: PowerState or list of PowerStates
+        :return: Bool
+        """
+        if isinstance(states, str):
+            states = [states]
+        power_states = self.read_power_states()
+        return bool(power_states) and all(power_state in states for power_state in power_states)
+
+    @bind_context
+    def wait_for_power_state(self, states, timeout=None):
+        """
+        Method to poll PowerState with exponential backoff until every selected system is in one of the given states.
+        "power_state_poll_interval" is the first interval, doubled after every poll up to "power_state_max_interval".
+        :param states: target PowerState or list of PowerStates (i.e "Off", ["On"])
+        :param timeout: seconds to give up after, default "power_state_timeout".
+        :return: Bool, seconds the transition took
+        """
+        if isinstance(states, str):
+            states = [states]
+        if timeout is None:
+            timeout = self.config_dict.get("power_state_timeout", 300)
+        interval = self.config_dict.get("power_state_poll_interval", 1)
+        max_interval = self.config_dict.get("power_state_max_interval", 16)
+        start = time.time()
+        deadline = start + timeout
+        while True:
+            power_states = self.read_power_states()
+            elapsed = time.time() - start
+            if power_states and all(power_state in states for power_state in power_states):
+                self.current_context().power_transition_time = elapsed
+                return True, elapsed
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                logger.info("PowerState is still {} after {:.1f} seconds, expected {}".format(power_states, elapsed,
+                                                                                             states))
+                return False, elapsed
+            time.sleep(min(interval, remaining))
+            interval = min(interval * 2, max_interval)
+
+    def wait_for_restart(self):
+        """
+        Method to wait for a restart: the system has to leave "On" within "power_state_leave_timeout" seconds
+        (BMCs that restart too fast to see it are accepted) and then be "On" again.
+        :return: Bool, seconds the restart took
+        """
+        start = time.time()
+        self.wait_for_power_state(["Off", "PoweringOff", "PoweringOn"],
+                                  timeout=self.config_dict.get("power_state_leave_timeout", 10))
+        reached, elapsed = self.wait_for_power_state("On")
+        elapsed = time.time() - start
+        self.current_context().power_transition_time = elapsed
+        return reached, elapsed
+
+    @bind_context
     def system_power_on(self):
         """
                 Method power ON system.
                 :return: Bool, power usage.
         """
         try:
-            if "On" in self.get_power_state()[1][0]['PowerState']:
+            if self.in_power_state("On"):
                logger.info("system already power on state, so skipping power on opearation")
             else:
                status, results  = self.set_reset_type(reset_typ="On")
-               time.sleep(20)
-               if "On" in self.get_power_state()[1][0]['PowerState']:
-                   logger.info("system successfully power on")
+               if status == False:
+                   logger.info("system power on has failed")
+                   return False
+               reached, elapsed = self.wait_for_power_state("On")
+               if reached:
+                   logger.info("system successfully power on in {:.1f} seconds".format(elapsed))
                    return True
                else:
                    logger.info("system power on has failed")
@@ -1404,19 +2607,23 @@ class RedfishApi:
             logger.error("error msg: {}".format(e))
             return False
 
+    @bind_context
     def system_Forceoff(self):
         """
                 Method Force power off system.
                 :return: Bool
         """
         try:
-            if "Off" in self.get_power_state()[1][0]['PowerState']:
+            if self.in_power_state("Off"):
                logger.info("system already power off state, so skipping power off opearation")
             else:
                status, results = self.set_reset_type(reset_typ="ForceOff")
-               time.sleep(20)
-               if "Off" in self.get_power_state()[1][0]['PowerState']:
-                   logger.info("system successfully power off")
+               if status == False:
+                   logger.info("system power off has failed")
+                   return False
+               reached, elapsed = self.wait_for_power_state("Off")
+               if reached:
+                   logger.info("system successfully power off in {:.1f} seconds".format(elapsed))
                    return True
                else:
                    logger.info("system power off has failed")
@@ -1426,20 +2633,23 @@ class RedfishApi:
             logger.error("error msg: {}".format(e))
             return False
     
+    @bind_context
     def system_GracefulShutdown(self):
         """
                 Method Force power off system.
                 :return: Bool
         """
         try:
-            if "Off" in self.get_power_state()[1][0]['PowerState']:
+            if self.in_power_state("Off"):
                logger.info("system already power off state, so skipping gracefull shutdown opearation")
             else:
                status, results = self.set_reset_type(reset_typ="GracefulShutdown")
-               time.sleep(120)
-               print(self.get_power_state()[1][0]['PowerState'])
-               if "Off" in self.get_power_state()[1][0]['PowerState']:
-                   logger.info("system successfully shutdown gracefully")
+               if status == False:
+                   logger.info("system graceful shutdown has failed")
+                   return False
+               reached, elapsed = self.wait_for_power_state("Off")
+               if reached:
+                   logger.info("system successfully shutdown gracefully in {:.1f} seconds".format(elapsed))
                    return True
                else:
                    logger.info("system graceful shutdown has failed")
@@ -1449,6 +2659,7 @@ class RedfishApi:
             logger.error("error msg: {}".format(e))
             return False
 
+    @bind_context
     def system_ForceRestart(self):
         """
                 Method Force Restart system.
@@ -1456,9 +2667,12 @@ class RedfishApi:
         """
         try:
            status, results = self.set_reset_type(reset_typ="ForceRestart")
-           time.sleep(30)
-           if "On" in self.get_power_state()[1][0]['PowerState']:
-              logger.info("system successfully restarted forcely")
+           if status == False:
+               logger.info("system force restart  has failed")
+               return False
+           reached, elapsed = self.wait_for_restart()
+           if reached:
+              logger.info("system successfully restarted forcely in {:.1f} seconds".format(elapsed))
               return True
            else:
               logger.info("system force restart  has failed")
@@ -1468,19 +2682,23 @@ class RedfishApi:
             logger.error("error msg: {}".format(e))
             return False
     
+    @bind_context
     def system_graceful_restart(self):
         """
                 Method graceful restart system.
                 :return: Bool
         """
         try:
-            if "Off" in self.get_power_state()[1][0]['PowerState']:
+            if self.in_power_state("Off"):
                 logger.info("system is in shutdown state, not possible to do graceful restart so skipping")
             else:
                 status, results = self.set_reset_type(reset_typ="GracefulRestart")
-                time.sleep(30)
-                if "On" in self.get_power_state()[1][0]['PowerState']:
-                    logger.info("system successfully restarted gracefully")
+                if status == False:
+                    logger.info("system gracefully  restart  has failed")
+                    return False
+                reached, elapsed = self.wait_for_restart()
+                if reached:
+                    logger.info("system successfully restarted gracefully in {:.1f} seconds".format(elapsed))
                     return True
                 else:
                     logger.info("system gracefully  restart  has failed")
@@ -1490,6 +2708,7 @@ class RedfishApi:
             logger.error("error msg: {}".format(e))
             return False
     
+    @bind_context
     def system_power_off(self):
         """
                 Method Force power off system.
@@ -1502,56 +2721,193 @@ class RedfishApi:
             logger.error("error msg: {}".format(e))
             return False, None
 
-    def systems_wrapper(self, power_actions=None):
+    def collect_host_power(self, ctx):
         """
-                Method to get multiple system info.
-                :return: List
+        Method to collect the power usage row of one configured system.
+        :param ctx: HostContext of the system.
+        :return: row [System IP, Manufacturer Model, current, average, max, min, power state] or None on failure/skip.
         """
+        host_semaphore = self.host_semaphores[ctx.login_host]
+        if not host_semaphore.acquire(blocking=False):
+            logger.info("system {} is still busy with a previous request, skipping this cycle".format(ctx.login_host))
+            return None
+        try:
+            logger.info(ctx.login_host)
+            self.ensure_system_identity(ctx)
+            result = None
+            if self.config_dict.get("power_source") == "telemetry":
+                result = self.telemetry_power_usage(ctx=ctx)
+                if result[0] != True:
+                    logger.info("system {} falls back to the Power resource".format(ctx.login_host))
+            if not result or result[0] != True:
+                result = self.power_usage(ctx=ctx)
+            if not result or result[0] != True:
+                raise Exception("Failed to get power usage")
+            logger.info(result[1])
+            return [ctx.login_host, ctx.system_manufacturer + " " + ctx.system_model] + result[1]
+        except Exception as e:
+            logger.error("system {} error msg: {}".format(ctx.login_host, e))
+            return None
+        finally:
+            host_semaphore.release()
+
+    def collect_fleet_power(self):
+        """
+        Method to collect power usage rows of all configured systems in parallel.
+        "fleet_workers" sets the number of hosts queried at once. "fleet_host_timeout" (seconds) is the deadline of
+        the cycle counted from the submit of the hosts: a host not finished by then is left out of the cycle (a host
+        still queued is not queried at all), and a running one is skipped in the following cycles until its
+        collection has finished.
+        :return: List of rows in the order of config "systems".
+        """
+        workers = self.config_dict.get("fleet_workers", 1)
+        host_timeout = self.config_dict.get("fleet_host_timeout", None)
+        futures = None
+        timed_out = set()
+        if workers > 1:
+            if self.fleet_executor is None:
+                self.fleet_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="fleet")
+            futures = {}
+            for ctx in self.contexts:
+                previous = self.power_futures.get(ctx.login_host)
+                if previous is not None and not previous.done():
+                    continue
+                futures[ctx.login_host] = self.power_futures[ctx.login_host] = self.fleet_executor.submit(
+                    self.collect_host_power, ctx)
+            done, timed_out = wait(futures.values(), timeout=host_timeout or None)
+            for future in timed_out:
+                future.cancel()
         out = []
-        for index, host in enumerate(self.REDFISH_OBJ_list):
-            self.REDFISH_OBJ = host
-            self.REDFISH_OBJ.login(auth="basic")
-            logger.info(self.config_dict["systems"][index]["login_host"])
-            self.redfish_version = (self.REDFISH_OBJ.get(self.config_dict["base_url"], None)).dict[
-                "RedfishVersion"]
-            logger.info(self.redfish_version)
-            oem_keys=(self.REDFISH_OBJ.get(self.config_dict["base_url"], None)).dict["Oem"].keys()
-            if self.redfish_version in ["1.8.0", "1.11.0"]:
-               if ((self.redfish_version == "1.11.0") and (list(oem_keys)[0] == "Dell")):
-                  self.system_manufacturer = (self.REDFISH_OBJ.get(self.config_dict["system_url"], None)).dict[
-                  "Manufacturer"]
-                  logger.info(self.system_manufacturer)
-                  self.system_model = (self.REDFISH_OBJ.get(self.config_dict["system_url"], None)).dict["Model"]
-                  logger.info(self.system_model)
-               else:
-                  self.system_manufacturer = (self.REDFISH_OBJ.get(self.config_dict["system_url_1_8"], None)).dict[
-                  "Manufacturer"]
-                  logger.info(self.system_manufacturer)
-                  self.system_model = (self.REDFISH_OBJ.get(self.config_dict["system_url_1_8"], None)).dict["Model"]
-                  logger.info(self.system_model)
+        for ctx in self.contexts:
+            if futures is None:
+                row = self.collect_host_power(ctx)
+            elif ctx.login_host not in futures:
+                logger.error("system {} is still busy with a previous cycle, skipping".format(ctx.login_host))
+                continue
+            elif futures[ctx.login_host] in timed_out:
+                # report rows of a host that is still running stay in its context until it finishes
+                logger.error("system {} did not answer within {} seconds, skipping".format(ctx.login_host,
+                                                                                          host_timeout))
+                continue
             else:
-                self.system_manufacturer = (self.REDFISH_OBJ.get(self.config_dict["system_url"], None)).dict[
-                    "Manufacturer"]
-                logger.info(self.system_manufacturer)
-                self.system_model = (self.REDFISH_OBJ.get(self.config_dict["system_url"], None)).dict["Model"]
-                logger.info(self.system_model)
-            logger.info(power_actions)
-            if power_actions: 
-               if self.config_dict["systems"][index]["power_action"]:
-                  status, response = self.execute_power_exceptions()
-                  assert status
-                  logger.info("power actions has completed successfully")
-                  if response[0] == "Power off Done":
-                     out.append([self.config_dict["systems"][index]["login_host"],response[1],response[2]])
-               else:
-                    logger.info("user disabled the power actions for the system {}".format(self.config_dict["systems"][index]["login_host"]))
-                    out=out
+                row = futures[ctx.login_host].result()
+            self.html_results = self.html_results + ctx.drain_report()
+            if row is not None:
+                out.append(row)
+        logger.info("{} duplicate GETs coalesced so far".format(self.single_flight.saved))
+        return out
+
+    def execute_host_power_action(self, ctx):
+        """
+        Method to run the power limit enforcement of one configured system.
+        :param ctx: HostContext of the system.
+        :return: row [System IP, power limit, power, outcome, transition seconds, total seconds] or None
+                 when no action was needed.
+        """
+        start = time.time()
+        host_semaphore = self.host_semaphores[ctx.login_host]
+        host_semaphore.acquire()
+        try:
+            self.ensure_system_identity(ctx)
+            ctx.power_transition_time = None
+            result = self.execute_power_exceptions(ctx=ctx)
+            if not isinstance(result, tuple):
+                logger.info("no power action taken on system {}".format(ctx.login_host))
+                return None
+            status, response = result
+            elapsed = time.time() - start
+            logger.info("system {}: {} in {:.1f} seconds".format(ctx.login_host, response[0], elapsed))
+            if response[0] == "Power in-controle":
+                return None
+            return [ctx.login_host, response[1], response[2], response[0], ctx.power_transition_time, elapsed]
+        except Exception as e:
+            logger.error("system {} error msg: {}".format(ctx.login_host, e))
+            return None
+        finally:
+            host_semaphore.release()
+
+    def execute_fleet_power_actions(self):
+        """
+        Method to enforce power limits on all systems with "power_action" enabled in parallel.
+        At most "power_action_window" systems are handled at once. Systems with the same optional "rack" key start
+        "power_action_rack_stagger" seconds after each other, so a rack doesn't switch all its servers at once.
+        Systems not finished within "power_action_timeout" seconds get an outcome row saying so, and are skipped
+        by the following calls until their action has finished.
+        :return: List of rows [System IP, power limit, power, outcome, transition seconds, total seconds] in the
+                 order of config "systems", for systems that were over their limit or did not finish.
+        """
+        stagger = self.config_dict.get("power_action_rack_stagger", 0)
+        rack_positions = {}
+        now = time.time()
+        actions = []
+        for index, ctx in enumerate(self.contexts):
+            system = self.config_dict["systems"][index]
+            if not system["power_action"]:
+                logger.info("user disabled the power actions for the system {}".format(ctx.login_host))
+                continue
+            rack = system.get("rack", ctx.login_host)
+            position = rack_positions.get(rack, 0)
+            rack_positions[rack] = position + 1
+            actions.append((ctx, now + position * stagger))
+        if self.power_action_executor is None:
+            self.power_action_executor = ThreadPoolExecutor(
+                max_workers=self.config_dict.get("power_action_window", 8), thread_name_prefix="power-action")
+        timeout = self.config_dict.get("power_action_timeout", 600)
+        futures = {}
+        for ctx, start_at in actions:
+            previous = self.power_action_futures.get(ctx.login_host)
+            if previous is not None and not previous.done():
+                logger.error("system {} is still busy with a previous power action, skipping".format(ctx.login_host))
+                continue
+            future = futures[ctx.login_host] = self.power_action_futures[ctx.login_host] = Future()
+            # a staggered system is submitted by a timer once it is due, it doesn't hold a worker of the window
+            timer = threading.Timer(max(start_at - time.time(), 0), self._submit_power_action, (ctx, future))
+            timer.daemon = True
+            timer.start()
+        wait(futures.values(), timeout=timeout)
+        out = []
+        for ctx, start_at in actions:
+            future = futures.get(ctx.login_host)
+            if future is None:
+                continue
+            if not future.done():
+                # a system not started yet is dropped, one that is running finishes in the background
+                future.cancel()
+                logger.error("system {} did not finish its power action within {} seconds".format(ctx.login_host,
+                                                                                                  timeout))
+                out.append([ctx.login_host, None, None, "Not finished in {} seconds".format(timeout), None, None])
+                continue
+            row = future.result()
+            self.html_results = self.html_results + ctx.drain_report()
+            if row is not None:
+                out.append(row)
+        return out
+
+    def _submit_power_action(self, ctx, future):
+        if not future.set_running_or_notify_cancel():
+            return
+
+        def done(action):
+            if action.exception() is not None:
+                future.set_exception(action.exception())
             else:
-                status, function_out = self.power_usage()
-                logger.info(function_out)
-                if status:
-                    out.append([self.config_dict["systems"][index]["login_host"],
-                            self.system_manufacturer + " " + self.system_model] + function_out)
+                future.set_result(action.result())
+
+        try:
+            self.power_action_executor.submit(self.execute_host_power_action, ctx).add_done_callback(done)
+        except Exception as e:
+            # the pool was shut down by close()
+            future.set_exception(e)
+
+    def systems_wrapper(self, power_actions=None):
+        """
+                Method to get multiple system info.
+                :return: List
+        """
+        if not power_actions:
+            out = self.collect_fleet_power()
+        else:
+            out = self.execute_fleet_power_actions()
         logger.info(out)
         return out
     
@@ -0,0 +1,92 @@
+#Copyright (c) 2024 Samsung Electronics Corporation
+#SPDX-License-Identifier: BSD-3-Clause
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class CachedResource:
+    __slots__ = ("response", "etag", "stored_at")
+
+    def __init__(self, response, etag, stored_at):
+        self.response = response
+        self.etag = etag
+        self.stored_at = stored_at
+
+
+class ResourceCache:
+    """
+    Per-host cache of GET responses keyed by uri. Entries younger than ttl seconds are served without a request,
+    older entries are revalidated with If-None-Match against their ETag. The least recently used entry is evicted
+    when max_entries is reached.
+    """
+
+    def __init__(self, max_entries=512, ttl=5):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def lookup(self, uri):
+        """
+        Method to get the cached entry of an uri.
+        :param uri: resource uri
+        :return: CachedResource or None
+        """
+        with self._lock:
+            entry = self._entries.get(uri)
+            if entry is not None:
+                self._entries.move_to_end(uri)
+            return entry
+
+    def is_fresh(self, entry, max_age=None):
+        """
+        Method to check if an entry can be served without a request.
+        :param entry: CachedResource
+        :param max_age: seconds overriding the ttl, 0 always revalidates.
+        :return: Bool
+        """
+        max_age = self.ttl if max_age is None else max_age
+        return time.time() - entry.stored_at < max_age
+
+    def store(self, uri, response):
+        """
+        Method to store a GET response.
+        :param uri: resource uri
+        :param response: redfish library response with status 200
+        :return: None
+        """
+        etag = response.getheader("ETag")
+        if etag is None:
+            try:
+                etag = response.dict.get("@odata.etag")
+            except Exception:
+                etag = None
+        with self._lock:
+            self._entries[uri] = CachedResource(response, etag, time.time())
+            self._entries.move_to_end(uri)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def refresh(self, entry):
+        """
+        Method to restart the ttl of an entry the BMC confirmed with 304 Not Modified.
+        :param entry: CachedResource
+        :return: None
+        """
+        entry.stored_at = time.time()
+
+    def clear(self):
+        """
+        Method to drop all entries, used after a PATCH/POST/DELETE changed the host.
+        :return: None
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,131 @@
+#Copyright (c) 2024 Samsung Electronics Corporation
+#SPDX-License-Identifier: BSD-3-Clause
+
+import json
+import os
+import posixpath
+import sys
+import threading
+import zipfile
+from collections import OrderedDict
+from urllib.parse import urlparse
+
+import requests
+from jsonschema import Draft202012Validator
+from jsonschema.validators import validator_for
+from referencing import Registry, Resource
+from referencing.exceptions import NoSuchResource
+from referencing.jsonschema import DRAFT202012
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../lib")))
+import logger as logging
+from single_flight import SingleFlight
+
+logger = logging.get_logger(__name__)
+
+
+class SchemaRegistry:
+    """
+    Parsed Redfish JSON schemas by file name (i.e ComputerSystem.v1_20_0.json).
+    A schema is looked up in a bounded LRU of parsed schemas, then in the local schema directory, then in the DMTF
+    schema bundle archive (DSP8010 zip). Only if it is found nowhere and offline mode is off, it is downloaded once
+    from schema_url and written to the schema directory, so the next run needs no network.
+    Cross-schema $refs (http://redfish.dmtf.org/schemas/v1/Resource.json#/...) are resolved through the registry too,
+    by a referencing Registry whose retrieve callback looks the document up by file name.
+    Compiled validators are kept per schema name in a bounded LRU and shared by all threads.
+    Schemas are loaded outside the registry lock, one load per schema name at a time, so a slow download doesn't
+    hold up lookups of other schemas.
+    """
+
+    def __init__(self, schema_dir=None, bundle=None, schema_url=None, max_size=256, offline=False):
+        self.schema_dir = schema_dir
+        self.schema_url = schema_url
+        self.max_size = max_size
+        self.offline = offline
+        self.downloads = 0
+        self._schemas = OrderedDict()
+        self._validators = OrderedDict()
+        self._references = Registry(retrieve=self.retrieve)
+        self._lock = threading.Lock()
+        self._loads = SingleFlight()
+        self._bundle = None
+        self._bundle_members = {}
+        if bundle:
+            self._bundle = zipfile.ZipFile(bundle)
+            for member in self._bundle.namelist():
+                # DSP8010 bundles keep the JSON schemas in the "json-schema" folder
+                if "json-schema/" in member and member.endswith(".json"):
+                    self._bundle_members[posixpath.basename(member)] = member
+            logger.info("{} json schemas found in bundle {}".format(len(self._bundle_members), bundle))
+
+    def get(self, schema_name):
+        """
+        Method to get a parsed schema.
+        :param schema_name: schema file name i.e ComputerSystem.v1_20_0.json
+        :return: schema dict or None if it is not available
+        """
+        with self._lock:
+            if schema_name in self._schemas:
+                self._schemas.move_to_end(schema_name)
+                return self._schemas[schema_name]
+        schema = self._loads.do(schema_name, lambda: self._load(schema_name))
+        if schema is not None:
+            with self._lock:
+                self._schemas[schema_name] = schema
+                if len(self._schemas) > self.max_size:
+                    self._schemas.popitem(last=False)
+        return schema
+
+    def validator(self, schema_name):
+        """
+        Method to get the compiled validator of a schema.
+        :param schema_name: schema file name i.e ComputerSystem.v1_20_0.json
+        :return: jsonschema validator or None if the schema is not available
+        """
+        with self._lock:
+            if schema_name in self._validators:
+                self._validators.move_to_end(schema_name)
+                return self._validators[schema_name]
+        schema = self.get(schema_name)
+        if schema is None:
+            return None
+        # Redfish schemas name their own metaschema in $schema, they are validated as the latest draft
+        validator = validator_for(schema, default=Draft202012Validator)(schema, registry=self._references)
+        with self._lock:
+            self._validators[schema_name] = validator
+            if len(self._validators) > self.max_size:
+                self._validators.popitem(last=False)
+        return validator
+
+    def _load(self, schema_name):
+        if self.schema_dir:
+            path = os.path.join(self.schema_dir, schema_name)
+            if os.path.exists(path):
+                with open(path) as schema_file:
+                    return json.load(schema_file)
+        if schema_name in self._bundle_members:
+            return json.loads(self._bundle.read(self._bundle_members[schema_name]))
+        if self.offline or not self.schema_url:
+            logger.error("{}-not found in local schema directory or bundle".format(schema_name))
+            return None
+        result = requests.get(self.schema_url + schema_name)
+        if result.status_code != 200:
+            logger.error("{}-not found with response code as:{}".format(schema_name, result.status_code))
+            return None
+        self.downloads += 1
+        if self.schema_dir:
+            os.makedirs(self.schema_dir, exist_ok=True)
+            with open(os.path.join(self.schema_dir, schema_name), "w") as schema_file:
+                schema_file.write(result.text)
+        return json.loads(result.text)
+
+    def retrieve(self, uri):
+        """
+        Method to retrieve a $ref document from the registry instead of the network.
+        :param uri: document uri without fragment i.e http://redfish.dmtf.org/schemas/v1/Resource.json
+        :return: referencing Resource
+        """
+        schema = self.get(posixpath.basename(urlparse(uri).path))
+        if schema is None:
+            raise NoSuchResource(ref=uri)
+        return Resource.from_contents(schema, default_specification=DRAFT202012)
@@ -0,0 +1,79 @@
+#Copyright (c) 2024 Samsung Electronics Corporation
+#SPDX-License-Identifier: BSD-3-Clause
+
+import atexit
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../lib")))
+import logger as logging
+
+logger = logging.get_logger(__name__)
+
+
+class SessionPool:
+    """
+    Keeps one logged in redfish client per host. With auth "session" every host gets one Redfish session
+    (X-Auth-Token) that is reused across polling cycles, re-created only when the BMC answers 401, and
+    deleted when the process exits.
+    """
+
+    def __init__(self, auth="session"):
+        self.auth = auth
+        self._clients = {}
+        self._generations = {}
+        self._locks = {}
+        atexit.register(self.close_all)
+
+    def connect(self, login_host, client):
+        """
+        Method to add a host to the pool and log in once.
+        :param login_host: host ip or name, key of the pool.
+        :param client: redfish client of the host.
+        :return: logged in client
+        """
+        self._locks[login_host] = threading.Lock()
+        self._clients[login_host] = client
+        self._generations[login_host] = 0
+        client.login(auth=self.auth)
+        logger.info("{} logged in with {} authentication".format(login_host, self.auth))
+        return client
+
+    def generation(self, login_host):
+        """
+        Method to get the login counter of a host, used to detect that another thread already re-authenticated.
+        :param login_host: host ip or name.
+        :return: int
+        """
+        return self._generations[login_host]
+
+    def reauthenticate(self, login_host, generation):
+        """
+        Method to log in again after the BMC rejected the session token with 401.
+        :param login_host: host ip or name.
+        :param generation: value of generation() seen by the failed request.
+        :return: None
+        """
+        with self._locks[login_host]:
+            if self._generations[login_host] != generation:
+                return
+            client = self._clients[login_host]
+            if self.auth == "session":
+                # the expired session is gone on the BMC side already, only drop our token
+                client.set_session_key(None)
+            client.login(auth=self.auth)
+            self._generations[login_host] += 1
+            logger.info("{} re-authenticated after 401".format(login_host))
+
+    def close_all(self):
+        """
+        Method to log out all sessions of the pool.
+        :return: None
+        """
+        for login_host, client in list(self._clients.items()):
+            try:
+                client.logout()
+            except Exception as e:
+                logger.error("{} logout failed, error msg: {}".format(login_host, e))
+        self._clients.clear()
@@ -0,0 +1,103 @@
+#Copyright (c) 2024 Samsung Electronics Corporation
+#SPDX-License-Identifier: BSD-3-Clause
+
+import heapq
+import itertools
+import os
+import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../lib")))
+import logger as logging
+
+logger = logging.get_logger(__name__)
+
+
+class _Task:
+    __slots__ = ("location", "poll", "future")
+
+    def __init__(self, location, poll, future):
+        self.location = location
+        self.poll = poll
+        self.future = future
+
+
+class TaskMonitor:
+    """
+    Tracks long running Redfish tasks (PATCH/POST answered with 202 Accepted) of all hosts on one scheduler thread,
+    which hands the due polls to a pool of worker threads, so a slow BMC doesn't hold up the tasks of the others.
+    Each task uri is polled again after the Retry-After of its last answer, or default_interval seconds without one.
+    watch() returns a Future that is resolved with the final task response, so many mutations can be submitted
+    and waited on together.
+    """
+
+    def __init__(self, default_interval=5, workers=4):
+        self.default_interval = default_interval
+        self.workers = workers
+        self._heap = []
+        self._polling = 0
+        self._executor = None
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._thread = None
+
+    def watch(self, response, poll):
+        """
+        Method to track the task of a PATCH/POST response.
+        :param response: redfish library response of the PATCH/POST
+        :param poll: callable that GETs a task uri and returns the redfish library response
+        :return: Future resolved with the final task response, or with response itself when it is no task.
+        """
+        future = Future()
+        if not response.is_processing:
+            future.set_result(response)
+            return future
+        location = response.task_location
+        if location is None:
+            future.set_exception(ValueError("We are processing a 202, but provide no location"))
+            return future
+        self._schedule(time.time(), _Task(location, poll, future))
+        return future
+
+    def pending(self):
+        """
+        Method to get the number of tasks still being polled.
+        :return: int
+        """
+        with self._condition:
+            return len(self._heap) + self._polling
+
+    def _schedule(self, due, task):
+        with self._condition:
+            heapq.heappush(self._heap, (due, next(self._sequence), task))
+            if self._thread is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="task-poll")
+                self._thread = threading.Thread(target=self._run, name="task-monitor", daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._heap or self._heap[0][0] > time.time():
+                    self._condition.wait(self._heap[0][0] - time.time() if self._heap else None)
+                due, sequence, task = heapq.heappop(self._heap)
+                self._polling += 1
+            self._executor.submit(self._poll, task)
+
+    def _poll(self, task):
+        try:
+            task_response = task.poll(task.location)
+        except Exception as e:
+            logger.error("polling task {} failed, error msg: {}".format(task.location, e))
+            task.future.set_exception(e)
+            task_response = None
+        if task_response is not None and task_response.is_processing:
+            retry_after = task_response.retry_after
+            self._schedule(time.time() + (retry_after if retry_after else self.default_interval), task)
+        elif task_response is not None:
+            task.future.set_result(task_response)
+        with self._condition:
+            self._polling -= 1
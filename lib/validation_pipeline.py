@@ -0,0 +1,142 @@
+#Copyright (c) 2024 Samsung Electronics Corporation
+#SPDX-License-Identifier: BSD-3-Clause
+
+import atexit
+import itertools
+import os
+import re
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from jsonschema.exceptions import best_match
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../lib")))
+import logger as logging
+from schema_registry import SchemaRegistry
+
+logger = logging.get_logger(__name__)
+
+MARKER = re.compile("<!--json-validation-([0-9]+)-->")
+
+# schema registry of a pipeline worker process
+_worker_registry = None
+
+
+def check_instance(registry, schema_name, instance):
+    """
+    Method to validate a response body with the cached validator of its schema.
+    :param registry: SchemaRegistry
+    :param schema_name: schema file name got from '@odata.type'
+    :param instance: response body dict
+    :return: None if the schema is not available, ("PASS", None) or ("FAIL", dict of mismatch details)
+    """
+    validator = registry.validator(schema_name)
+    if validator is None:
+        return None
+    error = best_match(validator.iter_errors(instance))
+    if error is None:
+        return "PASS", None
+    return "FAIL", {"message": error.message, "instance": str(error.instance), "path": str(error.path),
+                    "schema": str(error.schema), "schema_path": str(error.schema_path)}
+
+
+def validation_row(url, result):
+    """
+    Method to log a validation result and build its HTML report cell.
+    :param url: url of the validated response
+    :param result: return value of check_instance()
+    :return: HTML cell closing the report row of the url, empty if there is no result
+    """
+    if result is None:
+        return ""
+    msg, details = result
+    if msg == "PASS":
+        logger.info("JSON schema validated for url '{}'".format(url))
+        return "<td class=\"pass center\" width=\"30%\">PASS</td></tr>"
+    logger.error("JSON schema doesn't match for url '{}'".format(url))
+    logger.error(
+        "EXACT MISMATCH MSG OF RESPONSE BODY WITH JSON SCHEMA :\n{}\n\nRESPONSE BODY PARAMETERS:\n{},\nPRESENT AT: '{}' \nDOESN'T MATCHES WITH\nJSON SCHEMA PARAMETERS:\n{},\nPRESENT AT: '{}'" \
+            .format(details["message"], details["instance"], details["path"], details["schema"],
+                    details["schema_path"]))
+    msg = "FAIL: JSON schema doesn't matches for this URI because of the reason : {}".format(details["message"])
+    return "<td class=\"fail center\" width=\"30%\">" + msg + "</td></tr>"
+
+
+def _init_worker(registry_options):
+    global _worker_registry
+    _worker_registry = SchemaRegistry(**registry_options)
+
+
+def _check_in_worker(schema_name, instance):
+    return check_instance(_worker_registry, schema_name, instance)
+
+
+class ValidationPipeline:
+    """
+    JSON schema validation as a separate stage on a process pool. The fetch stage submits response bodies and gets
+    a marker to put into the HTML report in place of the validation cell; resolve() waits for the results and
+    replaces the markers with the same PASS/FAIL cells validate_json writes inline.
+    At most max_pending results wait for resolve(), the oldest is dropped beyond that (its report row gets no
+    validation cell); pending validations are cancelled on shutdown and at exit.
+    """
+
+    def __init__(self, registry_options, workers, max_pending=10000):
+        self._executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                             initargs=(registry_options,))
+        self.max_pending = max_pending
+        self.dropped = 0
+        self._pending = OrderedDict()
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        atexit.register(self.shutdown)
+
+    def submit(self, url, schema_name, instance):
+        """
+        Method to queue one response body for validation.
+        :param url: url of the response
+        :param schema_name: schema file name got from '@odata.type'
+        :param instance: response body dict
+        :return: marker to be added to the HTML report
+        """
+        future = self._executor.submit(_check_in_worker, schema_name, instance)
+        with self._lock:
+            validation_id = next(self._ids)
+            self._pending[validation_id] = (url, future)
+            while len(self._pending) > self.max_pending:
+                dropped_url, dropped_future = self._pending.popitem(last=False)[1]
+                dropped_future.cancel()
+                self.dropped += 1
+                logger.error("validation of url '{}' dropped, results are not being resolved".format(dropped_url))
+        return "<!--json-validation-{}-->".format(validation_id)
+
+    def resolve(self, html_results):
+        """
+        Method to replace the markers of an HTML report by the validation results, waiting for them if needed.
+        :param html_results: HTML report rows
+        :return: HTML report rows with PASS/FAIL cells
+        """
+        def replace(match):
+            with self._lock:
+                pending = self._pending.pop(int(match.group(1)), None)
+            if pending is None:
+                return ""
+            url, future = pending
+            try:
+                return validation_row(url, future.result())
+            except Exception as e:
+                logger.error("JSON schema validation of url '{}' failed, error msg: {}".format(url, e))
+                return ""
+        return MARKER.sub(replace, html_results)
+
+    def shutdown(self):
+        """
+        Method to cancel the pending validations and stop the worker processes.
+        :return: None
+        """
+        with self._lock:
+            for url, future in self._pending.values():
+                future.cancel()
+            self._pending.clear()
+        self._executor.shutdown(cancel_futures=True)